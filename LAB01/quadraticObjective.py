@@ -10,12 +10,13 @@
 # c: real number
 
 # Input Definition:
-# x: vector in R**n (domain space)
+# x: vector in R**n (domain space) or matrix in R**nxk (k points as columns) for objective() and gradient()
 
 # Output Definition:
-# objective(): real number, evaluation at x for parameters p
-# gradient(): vector in R**n, evaluation of gradient wrt x
+# objective(): 1xk array, evaluation at every column of x
+# gradient(): matrix in R**nxk, evaluation of gradient wrt x at every column of x
 # hessian(): matrix in R**nxn, evaluation of hessian wrt x
+# hessianVectorProduct(): hessian wrt x at x times v, v can be a vector in R**n or a matrix in R**nxk
 
 # Required files:
 # < none >
@@ -34,6 +35,9 @@
 # hess = myObjective.hessian(b)
 # should return hess = [[1, 0],[0, 1]]
 
+# hv = myObjective.hessianVectorProduct(b, b)
+# should return hv = [[1],[1]]
+
 import numpy as np
 
 
@@ -45,13 +49,15 @@ def matrnr():
 
 class quadraticObjective:
 
+    supportsBatch = True # objective and gradient accept many points as columns
+
     def __init__(self, A: np.array, b: np.array, c: float):
         self.A = A # system matrix
         self.b = b # linear part
         self.c = c # constant part
 
     def objective(self, x: np.array):
-        f = 0.5 * (x.T @ (self.A @ x)) + self.b.T @ x + self.c # formula for quadratic function
+        f = 0.5 * np.sum(x * (self.A @ x), axis=0) + self.b.T @ x + self.c # formula for quadratic function, one value per column
         return f
 
     def gradient(self, x: np.array):
@@ -61,3 +67,7 @@ class quadraticObjective:
     def hessian(self, x: np.array):
         h = self.A # hessian is equal to system matrix
         return h
+
+    def hessianVectorProduct(self, x: np.array, v: np.array):
+        hv = self.A @ v # hessian times v is system matrix times v
+        return hv
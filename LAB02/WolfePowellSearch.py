@@ -11,9 +11,20 @@
 # sigma: value in (0, 1 / 2), marks quality of decrease. Default value: 1.0e-3
 # rho: value in (sigma, 1), marks quality of steepness. Default value: 1.0e-2
 # verbose: bool, if set to true, verbose information is displayed
+# fx: objective value at x, if already known. Default value: None (evaluated here)
+# gradx: gradient at x, if already known. Default value: None (evaluated here)
+# fullOutput: bool, if set to true, objective value, gradient and failure reason are returned as well
+# maxEvals: positive integer, budget of objective plus gradient evaluations along the line. Default value: 100
+# tMin: positive value, smallest step size or bracket length before giving up. Default value: 1.0e-12
+# tMax: value bigger than 1, largest step size before giving up. Default value: 1.0e12
 
 # Output Definition:
-# t: t is set, such that t satisfies both Wolfe - Powell conditions
+# t: t is set, such that t satisfies both Wolfe - Powell conditions.
+# If a budget is exhausted, t is the evaluated step with sufficient decrease and lowest objective value, or 0 if there is none.
+# ft: objective value at x+t*d, only returned if fullOutput is set
+# gradt: gradient at x+t*d, only returned if fullOutput is set
+# failReason: '' on success, otherwise 'maxEvals', 'tMin' or 'tMax', only returned if fullOutput is set
+# Every trial step t is evaluated at most once for the objective and once for the gradient.
 
 # Required files:
 # < none >
@@ -55,9 +66,11 @@ def matrnr():
     return matrnr
 
 
-def WolfePowellSearch(f, x: np.array, d: np.array, sigma=1.0e-3, rho=1.0e-2, verbose=0):
-    fx = f.objective(x) # store objective
-    gradx = f.gradient(x) # store gradient
+def WolfePowellSearch(f, x: np.array, d: np.array, sigma=1.0e-3, rho=1.0e-2, verbose=0, fx=None, gradx=None, fullOutput=0, maxEvals=100, tMin=1.0e-12, tMax=1.0e12):
+    if fx is None: # if no objective value at x is handed over
+        fx = f.objective(x) # store objective
+    if gradx is None: # if no gradient at x is handed over
+        gradx = f.gradient(x) # store gradient
     descent = gradx.T @ d # store descent value
 
     if descent >= 0: # if not a descent direction
@@ -69,6 +82,12 @@ def WolfePowellSearch(f, x: np.array, d: np.array, sigma=1.0e-3, rho=1.0e-2, ver
     if rho <= sigma or rho >= 1: # if rho does not fit to sigma
         raise TypeError('range of rho is wrong!')
 
+    if maxEvals < 1: # need at least one evaluation
+        raise TypeError('range of maxEvals is wrong!')
+
+    if tMin <= 0 or tMax <= 1: # step size limits must contain the initial guess
+        raise TypeError('range of tMin or tMax is wrong!')
+
     if verbose: # print information
         print('Start WolfePowellSearch...') # print start
 
@@ -76,51 +95,93 @@ def WolfePowellSearch(f, x: np.array, d: np.array, sigma=1.0e-3, rho=1.0e-2, ver
 
     # INCOMPLETE CODE STARTS, DO NOT FORGET TO WRITE A COMMENT FOR EACH LINE YOU WRITE
 
-    def WP1(ft, s):                                         # defining w1 
-        isWP1 = ft <= fx + s*sigma*descent                  # boolean check for checking if w1 is true
+    fCache = {} # objective values f(x+t*d) computed so far, keyed by t
+    gradCache = {} # gradients gradf(x+t*d) computed so far, keyed by t
+
+    def phi(s):                                             # objective along the search line
+        if s not in fCache:                                 # only evaluate f at a trial point once
+            fCache[s] = f.objective(x + s*d)                # store objective value for this t
+        return fCache[s]                                    # return stored objective value
+
+    def dphi(s):                                            # gradient along the search line
+        if s not in gradCache:                              # only evaluate the gradient at a trial point once
+            gradCache[s] = f.gradient(x + s*d)              # store gradient for this t
+        return gradCache[s]                                 # return stored gradient
+
+    def WP1(s):                                             # defining w1 
+        isWP1 = phi(s) <= fx + s*sigma*descent              # boolean check for checking if w1 is true
         return isWP1                                        # return the boolean
 
-    def WP2(gradft: np.array):                              # defining W2
-        isWP2 = gradft.T @ d >= rho*descent                 # boolean check for w2
+    def WP2(s):                                             # defining W2
+        isWP2 = dphi(s).T @ d >= rho*descent                # boolean check for w2
         return isWP2                                        # return the boolean
 
-    if gradx.T @ d >= 0:                                    # check the descent direction first before proceedimnmng
-        raise TypeError('descent direction check failed!')  # statemnt if the check fails
+    def budgetCheck(s):                                     # check evaluation budget and step size s (or bracket length) limits
+        if len(fCache) + len(gradCache) >= maxEvals:        # too many objective and gradient evaluations
+            return 'maxEvals'                               # report exhausted evaluation budget
+        if s > tMax:                                        # step size grew beyond the upper limit
+            return 'tMax'                                   # report unbounded expansion
+        if s < tMin:                                        # step size or bracket shrank below the lower limit
+            return 'tMin'                                   # report collapsed step size
+        return ''                                           # all budgets are fine
+
+    failReason = ''                                         # empty as long as no budget is exhausted
 
-    if WP1(f.objective(x+t*d), t) == False:                 # check if w1 paases
+    if WP1(t) == False:                                     # check if w1 paases
         t = t/2                                             # update t
-        while WP1(f.objective(x + t*d), t) == False:        # check for it again
+        failReason = budgetCheck(t)                         # stop backtracking once a budget is exhausted
+        while failReason == '' and WP1(t) == False:         # check for it again
             t = t/2                                         # update t again
+            failReason = budgetCheck(t)                     # check budgets for the new t
         t_minus = t                                         # if the intermediate check failed, update t_minus
         t_plus = 2*t                                        # and also t_plus
     
-    elif WP2(f.gradient(x + t*d)) == True:                  # check for w2
-        t_star = t                                          # update the t and return it
-        return t_star
-    
+    elif WP2(t) == True:                                    # check for w2
+        t_minus = t                                         # t already satisfies both conditions
+        t_plus = t                                          # so there is nothing left to refine
+
     else :                                                  # if the check failed, then 
         t = 2*t                                             # update t
-        while WP1(f.objective(x+t*d), t) == True:           # check for w1 now (front tracking)
+        failReason = budgetCheck(t)                         # stop front tracking once a budget is exhausted
+        while failReason == '' and WP1(t) == True:          # check for w1 now (front tracking)
             t = 2*t                                         # update t if passes
+            failReason = budgetCheck(t)                     # check budgets for the new t
         t_minus = t/2                                       # if it failed update t_minus
         t_plus = t                                          # and t_plus
 
-    t = t_minus                                             # updte t with t_minus
-    while WP2(f.gradient(x + t*d)) == False:                # check for w2
-        t = (t_minus + t_plus)/2                            # update t with the average of t- and t+
-        if WP1(f.objective(x + t*d),t) == True:             # check for w1
-            t_minus = t                                     # update t- if it passes
-        else:                                               # if not
-            t_plus = t                                      # update t+
-    t_star = t_minus                                        # assign t as t-
-    
+    if failReason == '':                                    # refine only if the bracket search succeeded
+        t = t_minus                                         # updte t with t_minus
+        while WP2(t) == False:                              # check for w2
+            failReason = budgetCheck(t_plus - t_minus)      # stop refining once a budget is exhausted or the bracket collapsed
+            if failReason != '':                            # if a budget is exhausted
+                break                                       # leave refinement loop
+            t = (t_minus + t_plus)/2                        # update t with the average of t- and t+
+            if WP1(t) == True:                              # check for w1
+                t_minus = t                                 # update t- if it passes
+            else:                                           # if not
+                t_plus = t                                  # update t+
+
+    if failReason == '':                                    # regular termination
+        t_star = t_minus                                    # assign t as t-
+    else:                                                   # budget exhausted, fall back to best known step
+        tW1 = [s for s in fCache if s > 0 and WP1(s)]       # all evaluated steps with sufficient decrease
+        if len(tW1) > 0:                                    # if there is at least one such step
+            t_star = min(tW1, key=lambda s: phi(s))         # take the one with lowest objective value
+        else:                                               # no step with sufficient decrease was found
+            t_star = 0                                      # stay at x
+        t = t_star                                          # report on the returned step
+        if verbose:                                         # print information
+            print('WolfePowellSearch failed with reason', failReason, 'after', len(fCache) + len(gradCache), 'evaluations') # print failure reason
+
     # INCOMPLETE CODE ENDS
 
-    if verbose:
-        xt = x + t * d
-        fxt = f.objective(xt)
-        gradxt = f.gradient(xt)
+    if verbose and t > 0:
         print('WolfePowellSearch terminated with t=', t)
-        print('Wolfe-Powell: ', fxt, '<=', fx+t*sigma*descent, ' and ', gradxt.T @ d, '>=', rho*descent)
+        print('Wolfe-Powell: ', phi(t), '<=', fx+t*sigma*descent, ' and ', dphi(t).T @ d, '>=', rho*descent)
+
+    if fullOutput: # if the caller wants to reuse the evaluations at the accepted point
+        if t_star == 0: # no step was accepted
+            return t_star, fx, gradx, failReason # objective and gradient at x
+        return t_star, phi(t_star), dphi(t_star), failReason
 
     return t_star
\ No newline at end of file
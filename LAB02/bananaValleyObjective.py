@@ -20,12 +20,13 @@ class bananaValleyObjective:
     # x -> 100*(x[1]]-x[0]**2)**2+(1-x[0])**2+2
 
     # Input Definition:
-    # x: vector in R**2 (domain space)
+    # x: vector in R**2 (domain space) or matrix in R**2xk (k points as columns) for objective and gradient
 
     # Output Definition:
-    # objective: real number, evaluation at x
-    # gradient: vector in R**2, evaluation of gradient wrt x
+    # objective: 1xk array, evaluation at every column of x
+    # gradient: matrix in R**2xk, evaluation of gradient wrt x at every column of x
     # hessian: matrix in R**2x2, evaluation of hessian wrt x
+    # hessianVectorProduct: hessian wrt x at x times v, v in R**2 or R**2xk
 
     # Test cases:
     # myObjective = bananaValleyObjective.objective(np.array([[1],[1]], dtype=float))
@@ -40,16 +41,18 @@ class bananaValleyObjective:
     # should return
     # myHessian = [[802, -400],[-400, 200]]
 
+    supportsBatch = True # objective and gradient accept many points as columns
+
     @staticmethod
     def objective(x: np.array):
-        y = 100*(x[1,0]-x[0,0]**2)**2+(1-x[0,0])**2+2 # objective definition
+        y = (100*(x[1,:]-x[0,:]**2)**2+(1-x[0,:])**2+2).reshape(1, -1) # objective definition, one value per column
         return y
 
     @staticmethod
     def gradient(x: np.array):
-        f_dx1 = -400 * (x[1,0] - x[0,0] ** 2) * x[0,0] - 2 * (1 - x[0,0]) # first gradient component
-        f_dx2 = 200 * (x[1,0] - x[0,0] ** 2) # second gradient component
-        return np.array([[f_dx1], [f_dx2]], dtype=float) # gradient
+        f_dx1 = -400 * (x[1,:] - x[0,:] ** 2) * x[0,:] - 2 * (1 - x[0,:]) # first gradient component of all columns
+        f_dx2 = 200 * (x[1,:] - x[0,:] ** 2) # second gradient component of all columns
+        return np.vstack((f_dx1, f_dx2)).astype(float) # gradients as columns
 
     @staticmethod
     def hessian(x: np.array):
@@ -57,3 +60,7 @@ class bananaValleyObjective:
         f_dx12 = -400 * x[0,0] # Hessian entry for x1x2 = for x2x1
         f_dx22 = 200 # Hessian entry for x2x2
         return np.array([[f_dx11, f_dx12], [f_dx12, f_dx22]], dtype=float) # hessian
+
+    @staticmethod
+    def hessianVectorProduct(x: np.array, v: np.array):
+        return bananaValleyObjective.hessian(x) @ v # 2x2 hessian is cheap, multiply it with v
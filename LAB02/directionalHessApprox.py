@@ -1,18 +1,30 @@
 # Optimization for Engineers - Dr.Johannes Hild
 # directional Hessian Approximation
 
-# Purpose: Approximates Hessian times direction with central differences
+# Purpose: Approximates Hessian times direction with central or forward differences.
+# If f provides an analytic product via .hessianVectorProduct(x, v), that one is returned instead.
 
 # Input Definition:
-# f: objective class with methods .objective() and .gradient()
+# f: objective class with methods .objective() and .gradient(), optionally .hessianVectorProduct()
 # x: column vector in R ** n(domain point)
 # d: column vector in R ** n(search direction)
-# delta: tolerance for termination. Default value: 1.0e-6
+# delta: step length of the difference quotient. Default value: 1.0e-6
+# If set to None, delta is scaled with norm(x) and machine epsilon: sqrt(epsilon)*(1+norm(x)) for forward
+# and epsilon**(1/3)*(1+norm(x)) for central differences.
 # verbose: bool, if set to true, verbose information is displayed
+# mode: 'central' (two gradient evaluations) or 'forward' (one gradient evaluation). Default value: 'central'
+# gradx: gradient at x, reused by forward differences if already known. Default value: None (evaluated here)
 
 # Output Definition:
 # dH: Hessian times direction, column vector in R ** n
 
+# Batched variant directionalHessApproxBatch(f, x, D, delta, executor, verbose, mode, gradx):
+# D: matrix in R ** nxk, every column is one direction
+# executor: optional concurrent.futures executor (e.g. ProcessPoolExecutor), used to evaluate the 2k (forward: k) gradients
+# in parallel if f does not support batched input. Default value: None (evaluate one after another)
+# DH: matrix in R ** nxk, j-th column is Hessian times D[:, j]
+# If f has the attribute supportsBatch set to true, f.gradient() is called once with all perturbed points as one matrix.
+
 # Required files:
 # < none >
 
@@ -25,6 +37,13 @@
 # dH = directionalHessApprox(myObjective, x, d)
 # should return dH = [[1.55491],[0]]
 
+# D = np.array([[1, 0], [1, 1]])
+# DH = directionalHessApproxBatch(myObjective, x, D)
+# should return DH = [[1.55491, 0],[0, 0]]
+
+# dH = directionalHessApprox(myObjective, x, d, None, 0, 'forward')
+# should return dH close to [[1.55491],[0]]
+
 import numpy as np
 
 
@@ -34,15 +53,91 @@ def matrnr():
     return matrnr
 
 
-def directionalHessApprox(f, x: np.array, d: np.array, delta=1.0e-6, verbose=0):
+def differenceStep(x: np.array, mode='central'):
+    machineEps = np.finfo(float).eps # machine epsilon of double precision
+    if mode == 'forward': # forward differences balance truncation and rounding error at sqrt(epsilon)
+        return np.sqrt(machineEps) * (1 + np.linalg.norm(x))
+    return machineEps ** (1/3) * (1 + np.linalg.norm(x)) # central differences balance them at epsilon**(1/3)
+
+
+def directionalHessApprox(f, x: np.array, d: np.array, delta=1.0e-6, verbose=0, mode='central', gradx=None):
+
+    if mode != 'central' and mode != 'forward': # check for known difference scheme
+        raise TypeError('mode is wrong!')
 
     if verbose: # print information
         print('Start directionalHessApprox...') # print start
 
+    if hasattr(f, 'hessianVectorProduct'): # objective knows its hessian times direction
+        dH = f.hessianVectorProduct(x, d) # exact product, no gradient evaluations
+        if verbose: # print information
+            print('directionalHessApprox terminated with analytic dH=', dH) # print termination
+        return dH
+
+    if delta is None: # scale step length with x
+        delta = differenceStep(x, mode) # step length from machine epsilon
+
     norm_d = np.linalg.norm(d) # store norm of direction
-    dH = 0.5*norm_d/delta*(f.gradient(x+delta/norm_d*d)-f.gradient(x-delta/norm_d*d)) # compute directional Hessian via formula
+    if mode == 'forward': # one sided difference quotient
+        if gradx is None: # base gradient not handed over
+            gradx = f.gradient(x) # evaluate gradient at x
+        dH = norm_d/delta*(f.gradient(x+delta/norm_d*d)-gradx) # compute directional Hessian via forward differences
+    else:
+        dH = 0.5*norm_d/delta*(f.gradient(x+delta/norm_d*d)-f.gradient(x-delta/norm_d*d)) # compute directional Hessian via formula
 
     if verbose: # print information
         print('directionalHessApprox terminated with dH=', dH) # print termination
 
     return dH
+
+
+def directionalHessApproxBatch(f, x: np.array, D: np.array, delta=1.0e-6, executor=None, verbose=0, mode='central', gradx=None):
+
+    if mode != 'central' and mode != 'forward': # check for known difference scheme
+        raise TypeError('mode is wrong!')
+
+    if verbose: # print information
+        print('Start directionalHessApproxBatch...') # print start
+
+    if hasattr(f, 'hessianVectorProduct'): # objective knows its hessian times direction
+        DH = f.hessianVectorProduct(x, D) # exact products for all columns at once
+        if verbose: # print information
+            print('directionalHessApproxBatch terminated with analytic DH=', DH) # print termination
+        return DH
+
+    if delta is None: # scale step length with x
+        delta = differenceStep(x, mode) # step length from machine epsilon
+
+    k = D.shape[1] # number of directions
+    norm_D = np.linalg.norm(D, axis=0) # norm of every direction
+    nonzero = norm_D > 0 # zero directions have zero Hessian product
+    scale = np.zeros(k) # step length per direction
+    scale[nonzero] = delta / norm_D[nonzero] # delta/norm(d) for every nonzero direction
+    steps = D * scale # scaled directions as columns
+    if mode == 'forward': # only points in positive direction
+        points = x + steps # all k perturbed points as nxk matrix
+    else:
+        points = np.hstack((x + steps, x - steps)) # all 2k perturbed points as nx2k matrix
+
+    if getattr(f, 'supportsBatch', False): # objective evaluates many points in one call
+        G = f.gradient(points) # all gradients as one matrix
+    else:
+        columns = [points[:, [j]] for j in range(points.shape[1])] # split into single column vectors
+        if executor is None: # no executor given
+            grads = [f.gradient(xj) for xj in columns] # evaluate one after another
+        else:
+            grads = list(executor.map(f.gradient, columns)) # evaluate concurrently
+        G = np.hstack(grads) # collect gradients as one matrix
+
+    if mode == 'forward': # one sided difference quotient
+        if gradx is None: # base gradient not handed over
+            gradx = f.gradient(x) # evaluate gradient at x
+        DH = norm_D / delta * (G - gradx) # forward difference formula for every column
+    else:
+        DH = 0.5 * norm_D / delta * (G[:, :k] - G[:, k:]) # central difference formula for every column
+    DH[:, ~nonzero] = 0 # zero direction gives zero product
+
+    if verbose: # print information
+        print('directionalHessApproxBatch terminated with DH=', DH) # print termination
+
+    return DH
@@ -7,17 +7,28 @@
 # t_k results from Wolfe-Powell
 
 # Input Definition:
-# f: objective class with methods .objective() and .gradient()
+# f: objective class with methods .objective() and .gradient(), optionally .hessianVectorProduct() for exact CG products
 # x0: column vector in R ** n(domain point)
 # eps: tolerance for termination. Default value: 1.0e-3
 # verbose: bool, if set to true, verbose information is displayed
+# hessMode: difference scheme for Hessian times direction. Default value: 'central'
+# 'central' uses two gradients per CG step, 'forward' reuses gradf(x_k) and needs one gradient per CG step,
+# 'adaptive' uses forward differences while norm(gradf(x_k)) >= 0.25 (eta_k is at its loosest value 0.5*norm(gradf(x_k)))
+# and central differences afterwards. Ignored if f has .hessianVectorProduct().
+# precond: preconditioner of the inner CG loop. Default value: None (no preconditioning)
+# 'diagonal' uses a positive diagonal estimate of the Hessian from the componentwise secant ratios of previous steps,
+# 'lbfgs' uses the L-BFGS inverse Hessian approximation built from the last `memory` outer steps,
+# a symmetric nxn matrix B (approximate Hessian) is factorized once by incompleteCholesky and applied by LLTSolver. Integer entries are converted to float.
+# memory: positive integer, number of stored step pairs for 'lbfgs'. Default value: 5
 
 # Output Definition:
 # xmin: column vector in R ** n(domain point)
 
 # Required files:
-# dA = directionalHessApprox(f, x, d) from directionalHessApprox.py
-# t = WolfePowellSearch(f, x, d) from WolfePowellSearch.py
+# dA = directionalHessApprox(f, x, d, delta, 0, mode, gradx) from directionalHessApprox.py
+# L = incompleteCholesky(B) from incompleteCholesky.py, only for a matrix preconditioner
+# y = LLTSolver(L, r) from LLTSolver.py, only for a matrix preconditioner
+# t, ft, gradt, failReason = WolfePowellSearch(f, x, d, fx=fx, gradx=gradx, fullOutput=1) from WolfePowellSearch.py
 
 # Test cases:
 # myObjective = noHessianObjective()
@@ -29,6 +40,8 @@
 import numpy as np
 import WolfePowellSearch as WP
 import directionalHessApprox as DHA
+import incompleteCholesky as IC
+import LLTSolver as LLT
 
 def matrnr():
     # set your matriculation number here
@@ -36,11 +49,25 @@ def matrnr():
     return matrnr
 
 
-def inexactNewtonCG(f, x0: np.array, eps=1.0e-3, verbose=0):
+def inexactNewtonCG(f, x0: np.array, eps=1.0e-3, verbose=0, hessMode='central', precond=None, memory=5):
 
     if eps <= 0: # check for positive eps
         raise TypeError('range of eps is wrong!')
 
+    if hessMode not in ('central', 'forward', 'adaptive'): # check for known difference scheme
+        raise TypeError('hessMode is wrong!')
+
+    precMode = precond if precond is None or isinstance(precond, str) else 'matrix' # kind of preconditioner
+    if precMode not in (None, 'diagonal', 'lbfgs', 'matrix'): # check for known preconditioner
+        raise TypeError('precond is wrong!')
+    if precMode == 'matrix': # matrix preconditioner handed over
+        precond = np.asarray(precond, dtype=float) # float copy so integer input is not truncated by the factorization
+        if precond.shape != (x0.shape[0], x0.shape[0]): # check for matching size
+            raise TypeError('shape of precond is wrong!')
+
+    if memory < 1: # check for positive memory
+        raise TypeError('range of memory is wrong!')
+
     if verbose: # print information
         print('Start inexactNewtonCG...') # print start
 
@@ -49,33 +76,68 @@ def inexactNewtonCG(f, x0: np.array, eps=1.0e-3, verbose=0):
 
     # INCOMPLETE CODE STARTS, DO NOT FORGET TO WRITE A COMMENT FOR EACH LINE YOU WRITE
 
+    fk = f.objective(xk)                                                    # Calculate objective value, reused by the line search
     grad_fk = f.gradient(xk)                                                # Calculate gradient for further use
     norm_grad_fk = np.linalg.norm(grad_fk)                                  # caluclate norm of the gradient for further use
     eta_k = np.min([(0.5, np.sqrt(norm_grad_fk))]) * norm_grad_fk           # set Eta value first
 
+    precDiag = np.ones_like(grad_fk, dtype=float)                            # diagonal Hessian estimate, identity until steps are known
+    sList = []                                                              # stored steps for L-BFGS
+    yList = []                                                              # stored gradient differences for L-BFGS
+    if precMode == 'matrix':                                                # approximate Hessian handed over
+        precL = IC.incompleteCholesky(precond)                              # factorize it once
+
+    def applyPrec(r: np.array):                                             # preconditioner applied to residual, approximates H^-1 r
+        if precMode is None:                                                # no preconditioning
+            return r                                                        # identity
+        if precMode == 'diagonal':                                          # diagonal preconditioner
+            return r / precDiag                                             # scale componentwise
+        if precMode == 'lbfgs':                                             # L-BFGS two loop recursion
+            q = r.copy()                                                    # start with residual
+            alphas = []                                                     # factors of the first loop
+            for s, y in zip(reversed(sList), reversed(yList)):              # newest pair first
+                a = float(s.T @ q) / float(y.T @ s)                         # projection factor
+                q = q - a * y                                               # remove component
+                alphas.append(a)                                            # store for second loop
+            if len(sList) > 0:                                              # scale initial matrix by newest curvature
+                q = float(sList[-1].T @ yList[-1]) / float(yList[-1].T @ yList[-1]) * q
+            for (s, y), a in zip(zip(sList, yList), reversed(alphas)):      # oldest pair first
+                b = float(y.T @ q) / float(y.T @ s)                         # correction factor
+                q = q + (a - b) * s                                         # add component back
+            return q                                                        # approximate inverse Hessian times r
+        return LLT.LLTSolver(precL, r)                                      # incomplete Cholesky preconditioner
+
     while norm_grad_fk > eps:                                               # Termination condition
         xj = xk.copy()                                                      # reassign value to use inside the loop
         rj = grad_fk.copy()                                                 # reassign the r to use inside the loop
-        dj = -rj.copy()                                                     # get the descent directionn first from rj, then will be updated inside
+        zj = applyPrec(rj)                                                  # preconditioned residual
+        dj = -zj.copy()                                                     # get the descent directionn first from rj, then will be updated inside
+        if hessMode == 'adaptive':                                          # choose difference scheme by progress
+            mode_k = 'forward' if norm_grad_fk >= 0.25 else 'central'       # cheap forward differences while the forcing term is loose
+        else:
+            mode_k = hessMode                                               # fixed difference scheme
+        delta_k = 1.0e-6 if mode_k == 'central' else None                   # forward differences use the step scaled with norm(x_k)
 
         while np.linalg.norm(rj) > eta_k:                                   # termination condition
 
             if np.linalg.norm(dj) < 1e-12:                                  # numerical sanity check
                 break                                                       # CG direction broke down numerically
 
-            dA = DHA.directionalHessApprox(f, xk, dj)                       # given as per the readme file
+            dA = DHA.directionalHessApprox(f, xk, dj, delta_k, 0, mode_k, grad_fk) # given as per the readme file, reusing grad_fk for forward differences
             rhoj = dj.T @ dA                                                # set rho from the output and descent direction
 
             if not np.isfinite(rhoj) or rhoj<= eps*np.linalg.norm(dj) ** 2: # sanity check also a check included in the algoirithem
                 break  # curvature fail or invalid
 
-            tj = (np.linalg.norm(rj) ** 2) / rhoj                           # calculate tj
+            tj = (rj.T @ zj) / rhoj                                         # calculate tj
             xj_new = xj + tj * dj                                           # update x with t and d
 
             rold = rj.copy()                                                # reuse r for the checks
+            zold = zj                                                       # preconditioned residual before the update
             rj = rold + tj * dA                                             # update r
-            beta_j = (np.linalg.norm(rj) ** 2)/(np.linalg.norm(rold) ** 2)  # calculate beta to update d
-            dj = -rj + beta_j * dj                                          # update descent direction d
+            zj = applyPrec(rj)                                              # preconditioned residual after the update
+            beta_j = (rj.T @ zj)/(rold.T @ zold)                            # calculate beta to update d
+            dj = -zj + beta_j * dj                                          # update descent direction d
 
             xj = xj_new.copy()                                              # reassign x to use later
 
@@ -84,10 +146,32 @@ def inexactNewtonCG(f, x0: np.array, eps=1.0e-3, verbose=0):
         if np.linalg.norm(dk) < 1e-12:                                      # the other check where xj = xk
             dk = -grad_fk                                                   # fallback to steepest descent if no CG progress (xj = xk)
 
-        tk = WP.WolfePowellSearch(f, xk, dk)                                # update t
+        tk, f_new, grad_new, wpFail = WP.WolfePowellSearch(f, xk, dk, fx=fk, gradx=grad_fk, fullOutput=1) # update t and take over objective and gradient at the new point
+        if wpFail != '' and not np.array_equal(dk, -grad_fk):              # if the line search ran out of budget along the CG direction
+            dk = -grad_fk                                                   # fall back to steepest descent
+            tk, f_new, grad_new, wpFail = WP.WolfePowellSearch(f, xk, dk, fx=fk, gradx=grad_fk, fullOutput=1) # and search along it instead
+        if tk == 0:                                                         # not even steepest descent gives sufficient decrease
+            if verbose:                                                     # print information
+                print('inexactNewtonCG stopped, Wolfe-Powell search failed with reason', wpFail) # print reason for early termination
+            break                                                           # stop instead of looping without progress
+        s_k = tk * dk                                                       # step of this iteration
+        y_k = grad_new - grad_fk                                            # change of gradient
+        if precMode == 'diagonal':                                          # secant information feeds the diagonal
+            sy = s_k * y_k                                                  # componentwise curvature
+            positive = sy > 0                                               # only positive secant ratios are usable
+            precDiag[positive] = sy[positive] / s_k[positive] ** 2          # componentwise secant estimate of the diagonal
+            precDiag = np.clip(precDiag, 1.0e-8 * np.max(precDiag), None)   # keep diagonal safely positive
+        if precMode == 'lbfgs':                                             # secant pairs feed L-BFGS
+            if float(s_k.T @ y_k) > 1.0e-12 * np.linalg.norm(s_k) * np.linalg.norm(y_k): # positive curvature only
+                sList.append(s_k)                                           # store step
+                yList.append(y_k)                                           # store gradient difference
+                if len(sList) > memory:                                     # memory exceeded
+                    sList.pop(0)                                            # drop oldest step
+                    yList.pop(0)                                            # drop oldest gradient difference
         xk = xk + tk * dk                                                   # update x for the last time
+        fk = f_new                                                          # objective value at the new x
+        grad_fk = grad_new                                                  # gradient at the new x
 
-        grad_fk = f.gradient(xk)                                            # calculate gradient to use for the next loop
         norm_grad_fk = np.linalg.norm(grad_fk)                              # calculate norm to use for next loop condition check
         eta_k = np.min((0.5, np.sqrt(norm_grad_fk))) * norm_grad_fk         # eta for next loop condition check
         countIter += 1                                                      # update the counter
@@ -96,7 +180,7 @@ def inexactNewtonCG(f, x0: np.array, eps=1.0e-3, verbose=0):
     # INCOMPLETE CODE ENDS
     
     if verbose: # print information
-        stationarity = np.linalg.norm(f.gradient(xk)) # store stationarity value
+        stationarity = np.linalg.norm(grad_fk) # store stationarity value
         print('inexactNewtonCG terminated after ', countIter, ' steps with norm of gradient =', stationarity) # print termination with stationarity value
 
     return xk
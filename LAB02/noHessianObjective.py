@@ -21,11 +21,11 @@ class noHessianObjective:
     # Has a local maximizing point at approx [[-0.0158], [0.0126]], and a local minimizing point at approx [-0.265;0.212] and a global minimizing point at approx [[0.261], [-0.209]]
 
     # Input Definition:
-    # x: vector in R**2 (domain space)
+    # x: vector in R**2 (domain space) or matrix in R**2xk (k points as columns)
 
     # Output Definition:
-    # objective: real number, evaluation of nonlinearObjective at x
-    # gradient: real column vector in R**2, evaluation of the gradient with respect to x at x
+    # objective: 1xk array, evaluation of nonlinearObjective at every column of x
+    # gradient: real matrix in R**2xk, evaluation of the gradient with respect to x at every column of x
 
     # Test cases:
 
@@ -37,20 +37,22 @@ class noHessianObjective:
     # should return
     # myGradient close to [[0],[0]]
 
+    supportsBatch = True # objective and gradient accept many points as columns
+
     @staticmethod
     def objective(x: np.array):
-        x1 = x[0,0] # first argument
-        x2 = x[1,0] # second argument
+        x1 = x[0,:] # first argument of all columns
+        x2 = x[1,:] # second argument of all columns
         value = -0.03 / ((x1 + 0.25) ** 2 + (x2 - 0.2) ** 2 + 0.03) - 0.1 / ((x1 - 0.25) ** 2 + (x2 + 0.2) ** 2 + 0.04) + 0.1 / (x1 ** 2 + x2 ** 2 + 0.05) + 1 + x1 ** 2 + x2 ** 2 + 1 # formula for objective
-        return value
+        return value.reshape(1, -1)
 
     @staticmethod
     def gradient(x: np.array):
-        x1 = x[0,0] # first argument
-        x2 = x[1,0] # second argument
+        x1 = x[0,:] # first argument of all columns
+        x2 = x[1,:] # second argument of all columns
         dx1 = 2 * (x1 + 0.25) * 0.03 / ((x1 + 0.25) ** 2 + (x2 - 0.2) ** 2 + 0.03) ** 2 + 2 * (x1 - 0.25) * 0.1 / ((x1 - 0.25) ** 2 + (x2 + 0.2) ** 2 + 0.04) ** 2 - 2 * x1 * 0.1 / (x1 ** 2 + x2 ** 2 + 0.05) ** 2 + 2 * x1 # formula for first gradient component
         dx2 = 2 * (x2 - 0.2) * 0.03 / ((x1 + 0.25) ** 2 + (x2 - 0.2) ** 2 + 0.03) ** 2 + 2 * (x2 + 0.2) * 0.1 / ((x1 - 0.25) ** 2 + (x2 + 0.2) ** 2 + 0.04) ** 2 - 2 * x2 * 0.1 / (x1 ** 2 + x2 ** 2 + 0.05) ** 2 + 2 * x2 # formula for second gradient component
-        g = np.array([[dx1], [dx2]]) # compose result
+        g = np.vstack((dx1, dx2)) # compose result, gradients as columns
         return g
 
     @staticmethod
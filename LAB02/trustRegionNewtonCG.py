@@ -0,0 +1,141 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# trust region Newton CG (Steihaug-Toint)
+
+# Purpose: Find xmin to satisfy norm(gradf(xmin))<=eps
+# Iteration: x_k = x_k + d_k if the step is accepted by the trust region test
+# d_k approximately minimizes the quadratic model gradf(x_k).T@d + 0.5*d.T@H@d subject to norm(d) <= radius_k.
+# It is computed by CG steps, which stop at the trust region boundary, when negative curvature is detected
+# (then the negative curvature direction is followed to the boundary) or when the residual is below eta_k.
+# radius_k is adapted to the ratio of actual and predicted decrease.
+
+# Input Definition:
+# f: objective class with methods .objective() and .gradient(), optionally .hessianVectorProduct() for exact CG products
+# x0: column vector in R ** n(domain point)
+# eps: tolerance for termination. Default value: 1.0e-3
+# verbose: bool, if set to true, verbose information is displayed
+# radius0: positive value, initial trust region radius. Default value: 1.0
+# radiusMax: value not smaller than radius0, upper bound for the trust region radius. Default value: 1.0e3
+# hessMode: difference scheme for Hessian times direction, 'central', 'forward' or 'adaptive' as in inexactNewtonCG.
+# Default value: 'central'
+
+# Output Definition:
+# xmin: column vector in R ** n(domain point)
+
+# Required files:
+# dA = directionalHessApprox(f, x, d, delta, 0, mode, gradx) from directionalHessApprox.py
+
+# Test cases:
+# myObjective = noHessianObjective()
+# x0 = np.array([[-0.01], [0.01]])
+# xmin = trustRegionNewtonCG(myObjective, x0, 1.0e-6, 1)
+# should return
+# xmin close to [[0.26],[-0.21]]
+
+# myObjective = bananaValleyObjective()
+# x0 = np.array([[0], [0]], dtype=float)
+# xmin = trustRegionNewtonCG(myObjective, x0, 1.0e-6, 1)
+# should return
+# xmin close to [[1],[1]]
+
+import numpy as np
+import directionalHessApprox as DHA
+
+
+def matrnr():
+    # set your matriculation number here
+    matrnr = 23356687
+    return matrnr
+
+
+def trustRegionNewtonCG(f, x0: np.array, eps=1.0e-3, verbose=0, radius0=1.0, radiusMax=1.0e3, hessMode='central'):
+
+    if eps <= 0: # check for positive eps
+        raise TypeError('range of eps is wrong!')
+
+    if radius0 <= 0 or radiusMax < radius0: # check for positive and consistent radii
+        raise TypeError('range of radius0 or radiusMax is wrong!')
+
+    if hessMode not in ('central', 'forward', 'adaptive'): # check for known difference scheme
+        raise TypeError('hessMode is wrong!')
+
+    if verbose: # print information
+        print('Start trustRegionNewtonCG...') # print start
+
+    countIter = 0 # counter for number of accepted steps
+    xk = x0 # initialize starting iteration
+
+    def toBoundary(z: np.array, d: np.array, radius):                      # step length tau >= 0 with norm(z + tau*d) = radius
+        zd = float(z.T @ d)                                                 # mixed term of the quadratic equation
+        dd = float(d.T @ d)                                                 # quadratic term of the quadratic equation
+        zz = float(z.T @ z)                                                 # constant term of the quadratic equation
+        return (-zd + np.sqrt(zd ** 2 + dd * (radius ** 2 - zz))) / dd      # positive root
+
+    fk = f.objective(xk)                                                    # objective value at the current point
+    grad_fk = f.gradient(xk)                                                # gradient at the current point
+    norm_grad_fk = np.linalg.norm(grad_fk)                                  # norm of the gradient for the termination check
+    radius = radius0                                                        # current trust region radius
+    n = xk.shape[0]                                                         # dimension, bounds the number of CG steps
+
+    while norm_grad_fk > eps:                                               # termination condition
+        eta_k = np.min((0.5, np.sqrt(norm_grad_fk))) * norm_grad_fk         # same forcing term as in inexactNewtonCG
+        if hessMode == 'adaptive':                                          # choose difference scheme by progress
+            mode_k = 'forward' if norm_grad_fk >= 0.25 else 'central'       # cheap forward differences while the forcing term is loose
+        else:
+            mode_k = hessMode                                               # fixed difference scheme
+        delta_k = 1.0e-6 if mode_k == 'central' else None                   # forward differences use the step scaled with norm(x_k)
+
+        zj = np.zeros_like(grad_fk, dtype=float)                            # CG iterate, the step from x_k
+        Hzj = np.zeros_like(zj)                                             # Hessian times zj, collected from the CG products
+        rj = grad_fk.copy()                                                 # residual of the Newton equation at zj
+        dj = -rj                                                            # first CG direction is steepest descent
+
+        for j in range(2 * n):                                              # CG steps, more than n only due to inexact products
+            dA = DHA.directionalHessApprox(f, xk, dj, delta_k, 0, mode_k, grad_fk) # Hessian times CG direction
+            rhoj = float(dj.T @ dA)                                         # curvature along dj
+            if not np.isfinite(rhoj) or rhoj <= 0:                          # negative curvature detected
+                tau = toBoundary(zj, dj, radius)                            # follow dj up to the boundary
+                zj = zj + tau * dj                                          # step along the negative curvature direction
+                Hzj = Hzj + tau * dA                                        # keep Hessian times step up to date
+                break                                                       # model decreases until the boundary
+            tj = float(rj.T @ rj) / rhoj                                    # CG step length
+            if np.linalg.norm(zj + tj * dj) >= radius:                      # full CG step would leave the trust region
+                tau = toBoundary(zj, dj, radius)                            # shorten it to the boundary
+                zj = zj + tau * dj                                          # step to the boundary
+                Hzj = Hzj + tau * dA                                        # keep Hessian times step up to date
+                break                                                       # boundary step is final
+            zj = zj + tj * dj                                               # regular CG update of the step
+            Hzj = Hzj + tj * dA                                             # keep Hessian times step up to date
+            rold = rj                                                       # residual before the update
+            rj = rold + tj * dA                                             # update residual
+            if np.linalg.norm(rj) <= eta_k:                                 # inexact Newton condition reached
+                break                                                       # step is accurate enough
+            beta_j = float(rj.T @ rj) / float(rold.T @ rold)                # Fletcher-Reeves factor
+            dj = -rj + beta_j * dj                                          # new conjugate direction
+
+        predicted = -float(grad_fk.T @ zj + 0.5 * zj.T @ Hzj)               # decrease of the quadratic model
+        x_new = xk + zj                                                     # trial point
+        f_new = f.objective(x_new)                                          # objective value at trial point
+        actual = float(fk - f_new)                                          # actual decrease of f
+        ratio = actual / predicted if predicted > 0 else -1.0               # agreement of model and objective
+
+        if ratio < 0.25:                                                    # poor agreement
+            radius = 0.25 * np.linalg.norm(zj)                              # shrink trust region below the rejected step
+        elif ratio > 0.75 and np.linalg.norm(zj) >= 0.99 * radius:          # good agreement at the boundary
+            radius = np.min((2 * radius, radiusMax))                        # enlarge trust region
+
+        if ratio > 1.0e-4:                                                  # enough decrease to accept the step
+            xk = x_new                                                      # move to trial point
+            fk = f_new                                                      # objective value at the new point
+            grad_fk = f.gradient(xk)                                        # gradient at the new point
+            norm_grad_fk = np.linalg.norm(grad_fk)                          # norm for the termination check
+            countIter += 1                                                  # count accepted steps
+
+        if radius < 1.0e-14 * (1 + np.linalg.norm(xk)):                     # trust region collapsed numerically
+            if verbose:                                                     # print information
+                print('trustRegionNewtonCG stopped, trust region radius collapsed to', radius) # print reason for early termination
+            break                                                           # stop instead of looping without progress
+
+    if verbose: # print information
+        print('trustRegionNewtonCG terminated after ', countIter, ' steps with norm of gradient =', norm_grad_fk) # print termination with stationarity value
+
+    return xk
@@ -18,6 +18,7 @@
 # objective(): real number, evaluation at x
 # gradient(): vector in R**n, evaluation of gradient wrt x
 # hessian(): matrix in R**nxn, evaluation of hessian wrt x
+# hessianVectorProduct(): hessian wrt x at x times v, v can be a vector in R**n or a matrix in R**nxk
 
 # Required files:
 # < none >
@@ -88,4 +89,11 @@ class boxObjective:
             h = self.A # return hessian
             return h
         else:
-            raise TypeError('boxObjective is not defined outside the box!')
\ No newline at end of file
+            raise TypeError('boxObjective is not defined outside the box!')
+
+    def hessianVectorProduct(self, x: np.array, v: np.array):
+        if self.isFeasible(x): # check feasibility first
+            hv = self.A @ v # hessian times v
+            return hv
+        else:
+            raise TypeError('boxObjective is not defined outside the box!')
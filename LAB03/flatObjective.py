@@ -8,12 +8,13 @@
 # < none >
 
 # Input Definition:
-# x: vector in R (domain space)
+# x: vector in R (domain space) or 1xk array (k points)
 
 # Output Definition:
-# objective(): real number, evaluation at x
-# gradient(): vector in R, evaluation of gradient wrt x
+# objective(): 1xk array, evaluation at every point
+# gradient(): 1xk array, evaluation of gradient wrt x at every point
 # hessian(): matrix in R, evaluation of hessian wrt x
+# hessianVectorProduct(): hessian wrt x at x times v
 
 # Required files:
 # < none >
@@ -32,6 +33,8 @@ def matrnr():
 
 class flatObjective:
 
+    supportsBatch = True # formulas act elementwise on many points
+
     def objective(self, x: np.array):
         f = x**4-1000*x # function definition
         return f
@@ -43,3 +46,7 @@ class flatObjective:
     def hessian(self, x: np.array):
         h = 12*x**2 # hessian definition
         return h
+
+    def hessianVectorProduct(self, x: np.array, v: np.array):
+        hv = 12*x**2 * v # hessian times v
+        return hv
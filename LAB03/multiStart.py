@@ -0,0 +1,124 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# multi start
+
+# Purpose: Runs a local descent method from many starting points, collects the distinct local minimizers found
+# and returns the best one. The runs are independent and can be distributed over a process pool.
+
+# Input Definition:
+# solver: descent method called as solver(f, x0, eps) or, if P is given, as solver(f, P, x0, eps),
+# e.g. NewtonDescent, inexactNewtonCG or projectedBFGSDescent. Must be a module level function for process pools.
+# f: objective class with method .objective() and whatever solver requires
+# X0: matrix in R ** nxm with the m starting points as columns, or a positive integer m. Then m starting points are
+# drawn with P.sample(m, rng) from the feasible set of P (e.g. projectionInBox or projectionInBall).
+# P: projection class with method .project() (and .sample() if X0 is an integer). Default value: None (unconstrained)
+# eps: tolerance for termination handed over to solver. Default value: 1.0e-3
+# tol: positive value, two minimizers x, y count as the same if norm(x-y) <= tol*(1+norm(y)). Default value: 1.0e-4
+# seed: seed for drawing starting points. Default value: None (random seed)
+# executor: optional concurrent.futures executor, runs the starts concurrently. Default value: None
+# workers: integer, if bigger than 1 and no executor is given, a process pool with this many workers is created. Default value: 1
+# verbose: bool, if set to true, verbose information is displayed
+# fullOutput: bool, if set to true, all distinct minimizers are returned as well
+
+# Output Definition:
+# xmin: column vector in R ** n, minimizer with lowest objective value
+# minimizers: matrix in R ** nxr, the r distinct minimizers as columns sorted by objective value, only returned if fullOutput is set
+# values: array in R ** r, objective values of the minimizers, only returned if fullOutput is set
+# counts: array in R ** r, number of starts that ended at each minimizer, only returned if fullOutput is set
+# Starts for which solver raises an exception are skipped, verbose mode prints their exceptions. If every start fails,
+# the exception is re-raised if all starts failed with the same exception type, otherwise an Exception listing the
+# types is raised from the first one.
+
+# Required files:
+# solver from the file it is defined in, e.g. xmin = projectedBFGSDescent(f, P, x0, eps) from projectedBFGSDescent.py
+
+# Test cases:
+# myObjective = noHessianObjective()
+# a = np.array([[-1], [-1]], dtype=float)
+# b = np.array([[1], [1]], dtype=float)
+# myBox = projectionInBox(a, b)
+# xmin, minimizers, values, counts = multiStart(projectedBFGSDescent, myObjective, 20, myBox, 1.0e-6, seed=0, fullOutput=1)
+# should return xmin close to [[0.26],[-0.21]] and the local minimizer close to [[-0.27],[0.21]] among minimizers
+
+import numpy as np
+from concurrent.futures import ProcessPoolExecutor
+
+
+def matrnr():
+    # set your matriculation number here
+    matrnr = 23356687
+    return matrnr
+
+
+def multiStartRun(task):
+    solver, f, P, x0, eps = task # unpack one start
+    try:
+        if P is None: # unconstrained solver
+            xmin = solver(f, x0, eps) # run local method
+        else:
+            xmin = solver(f, P, x0, eps) # run projected local method
+    except Exception as error: # failed run, e.g. iteration limit of a linear solver
+        return None, None, error # no minimizer, exception for the caller
+    return xmin, np.ravel(f.objective(xmin))[0], None # minimizer, its objective value and no exception
+
+
+def multiStart(solver, f, X0, P=None, eps=1.0e-3, tol=1.0e-4, seed=None, executor=None, workers=1, verbose=0, fullOutput=0):
+    if tol <= 0: # check for positive tol
+        raise TypeError('range of tol is wrong!')
+
+    if executor is None and workers > 1: # create a pool for this run
+        with ProcessPoolExecutor(max_workers=workers) as runExecutor: # pool is shut down after the run, also on errors
+            return multiStart(solver, f, X0, P, eps, tol, seed, runExecutor, 1, verbose, fullOutput) # run with the new pool
+
+    if verbose: # print information
+        print('Start multiStart...') # print start
+
+    if np.isscalar(X0): # number of starts instead of starting points
+        if P is None: # sampling needs a feasible set
+            raise TypeError('P is needed to draw starting points!')
+        X0 = P.sample(int(X0), np.random.default_rng(seed)) # draw starting points from the feasible set
+
+    m = X0.shape[1] # number of starts
+    tasks = [(solver, f, P, X0[:, [j]], eps) for j in range(m)] # one task per starting point
+    if executor is None: # no executor given
+        results = [multiStartRun(task) for task in tasks] # run one after another
+    else:
+        results = list(executor.map(multiStartRun, tasks)) # run concurrently
+
+    minimizers = [] # distinct minimizers found so far
+    values = [] # their objective values
+    counts = [] # number of starts ending there
+    errors = [] # exceptions of the failed starts
+    for j, (xmin, fmin, error) in enumerate(results): # collect results
+        if error is not None: # run failed
+            errors.append(error) # keep exception
+            if verbose: # print information
+                print('multiStart: start ', j, ' failed with ', type(error).__name__, ': ', error) # print failure
+            continue
+        for i in range(len(minimizers)): # compare with known minimizers
+            if np.linalg.norm(xmin - minimizers[i]) <= tol * (1 + np.linalg.norm(minimizers[i])): # same minimizer
+                counts[i] += 1 # one more start ended here
+                if fmin < values[i]: # keep the better representative
+                    minimizers[i] = xmin # replace minimizer
+                    values[i] = fmin # replace value
+                break
+        else: # new minimizer
+            minimizers.append(xmin) # store minimizer
+            values.append(fmin) # store value
+            counts.append(1) # first start ending here
+
+    if len(minimizers) == 0: # nothing converged
+        types = sorted({type(error).__name__ for error in errors}) # distinct exception types
+        if len(types) == 1: # every start failed the same way
+            raise errors[0]
+        raise Exception('multiStart: all runs failed with ' + ', '.join(types) + '!') from errors[0]
+
+    order = np.argsort(values) # best minimizer first
+    xmin = minimizers[order[0]] # best minimizer
+
+    if verbose: # print information
+        print('multiStart terminated after ', m, ' starts (', len(errors), ' failed) with ', len(minimizers), ' distinct minimizers, best value =', values[order[0]]) # print termination
+
+    if fullOutput: # all minimizers requested
+        return xmin, np.hstack([minimizers[i] for i in order]), np.array(values)[order], np.array(counts)[order]
+
+    return xmin
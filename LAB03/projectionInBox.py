@@ -9,12 +9,13 @@
 # eps: nonnegative value, tolerance for accepting being active. Default value: 1.0e-6.
 
 # Input Definition:
-# x: column vector in R ** n(domain space)
+# x: column vector in R ** n(domain space), project() also accepts a matrix in R ** nxk (k points as columns)
 
 # Output Definition:
 # projectedX: column vector in R ** n, satisfies box constraints
 # activeIndexSet: list of indices, collected indices mark x[i, 0] components with projectedX[i, 0]-a[i, 0] <= eps
 # or projectedX[i, 0] - b[i, 0] >= -eps
+# sample(m, rng): matrix in R ** nxm, m points drawn uniformly from the box as columns. rng is an optional numpy Generator.
 
 # Required files:
 # < none >
@@ -56,14 +57,7 @@ class projectionInBox:
         
     def project(self, x: np.array):
         n = x.shape[0] # get vector dimension
-        projectedX = x.copy() # initialize projected x
-        for i in range(n): # loop over dimension
-            if x[i, 0] < self.a[i, 0]: # project if below lower bound
-                projectedX[i, 0] = self.a[i, 0] # set value of projected x to lower bound
-          
-            if x[i, 0] > self.b[i, 0]: # project if above upper bound
-                projectedX[i, 0] = self.b[i, 0] # set value of projected x to upper bound
-                
+        projectedX = np.minimum(np.maximum(x, self.a[:n]), self.b[:n]) # clip every component to its bounds, works for all columns at once
         return projectedX
     
     def activeIndexSet(self, x: np.array):
@@ -74,3 +68,10 @@ class projectionInBox:
                 myList.append(i) # append eps-active index
 
         return myList
+
+    def sample(self, m: int, rng=None):
+        if rng is None: # no generator handed over
+            rng = np.random.default_rng() # use a freshly seeded one
+        n = self.a.shape[0] # get vector dimension
+        X = self.a + (self.b - self.a) * rng.random((n, m)) # uniform points in the box as columns
+        return X
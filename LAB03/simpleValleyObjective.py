@@ -9,12 +9,13 @@
 # p: vector in R**2 (parameter space)
 
 # Input Definition:
-# x: vector in R**2 (domain space)
+# x: vector in R**2 (domain space) or matrix in R**2xk (k points as columns) for objective and gradient
 
 # Output Definition:
-# objective: real number, evaluation at x for parameters p
-# gradient: vector in R**2, evaluation of gradient wrt x
+# objective: 1xk array, evaluation at every column of x for parameters p
+# gradient: matrix in R**2xk, evaluation of gradient wrt x at every column of x
 # hessian: matrix in R**2x2, evaluation of hessian wrt x
+# hessianVectorProduct(): hessian wrt x at x times v, v can be a vector in R**2 or a matrix in R**2xk
 # setParameters(): sets p
 # parameterGradient(): vector in R**2, evaluation of gradient wrt p
 
@@ -36,6 +37,10 @@
 # should return
 # myHessian = [[1, 0],[0, 2]]
 
+# myHv = simpleValleyObjective(p).hessianVectorProduct(x, x)
+# should return
+# myHv = [[0],[2]]
+
 
 import numpy as np
 
@@ -48,24 +53,26 @@ def matrnr():
 
 class simpleValleyObjective:
 
+    supportsBatch = True # objective and gradient accept many points as columns
+
     def __init__(self, p: np.array):
         self.p = p # parameters
 
     def objective(self, x: np.array):
         p0 = self.p[0, 0] # get first parameter
         p1 = self.p[1, 0] # get second parameter
-        x0 = x[0, 0] # get first argument
-        x1 = x[1, 0] # get second argument
-        f = np.cosh(x0) + p0*(x1-1)**2 + p1 # function formula
+        x0 = x[0, :] # get first argument of all columns
+        x1 = x[1, :] # get second argument of all columns
+        f = (np.cosh(x0) + p0*(x1-1)**2 + p1).reshape(1, -1) # function formula, one value per column
         return f
 
     def gradient(self, x: np.array):
         p0 = self.p[0, 0] # get first parameter
-        x0 = x[0, 0]  # get first argument
-        x1 = x[1, 0]  # get second argument
+        x0 = x[0, :]  # get first argument of all columns
+        x1 = x[1, :]  # get second argument of all columns
         f_dx0 = np.sinh(x0) # get derivative wrt x0
         f_dx1 = 2*p0*(x1-1) # get derivative wrt x1
-        g = np.array([[f_dx0], [f_dx1]]) # build gradient vector
+        g = np.vstack((f_dx0, f_dx1)) # build gradient vectors as columns
         return g
 
     def hessian(self, x: np.array):
@@ -77,6 +84,12 @@ class simpleValleyObjective:
         h = np.array([[f_dx00, f_dx01], [f_dx01, f_dx11]]) # build hessian matrix
         return h
 
+    def hessianVectorProduct(self, x: np.array, v: np.array):
+        p0 = self.p[0, 0] # get first parameter
+        x0 = x[0, 0]  # get first argument
+        hv = np.array([np.cosh(x0) * v[0, :], 2 * p0 * v[1, :]]) # hessian is diagonal, so scale the rows of v
+        return hv
+
     def setParameters(self, p: np.array):
         self.p = p # change parameter
 
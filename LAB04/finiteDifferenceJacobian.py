@@ -0,0 +1,154 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# Finite difference jacobian
+
+# Purpose: Provides .residual() and .jacobian() for an error vector that only offers .residual(), e.g. a
+# leastSquaresFeasiblePoint of constraints without .gradient(). The jacobian is approximated by finite differences.
+# Columns that share no row of the sparsity pattern are structurally orthogonal and are perturbed together
+# (Curtis-Powell-Reid grouping by greedy coloring), so one jacobian costs one residual evaluation per group instead
+# of one per column.
+
+# Input Definition:
+# R: error vector class with method .residual(), optionally .sparsityPattern(n) (e.g. leastSquaresFeasiblePoint)
+# n: dimension of the parameter space
+# pattern: boolean matrix in R**Nxn or scipy.sparse matrix, nonzero where the jacobian may be nonzero.
+# Default value: None, then R.sparsityPattern(n) is used if available, else the jacobian is treated as dense
+# mode: 'forward' or 'central', difference scheme. 'central' costs two residual evaluations per group. Default value: 'forward'
+# executor: optional concurrent.futures executor, evaluates the perturbed residuals of all groups concurrently. Default value: None
+# sparse: bool, if set to true, jacobian() returns a scipy.sparse CSR matrix. Requires scipy. Default value: False
+
+# Output Definition:
+# residual(): column vector in R**N, residual of R
+# jacobian(): matrix in R**Nxn, finite difference approximation of the jacobian of R, zero outside the pattern
+# residualAndJacobian(): residual() and jacobian(), the forward scheme reuses the residual at x
+# The residual of the last residual() call is reused if the jacobian is requested at the same point, as
+# levenbergMarquardtDescent does after accepted steps.
+# groups: list of index arrays, the column groups perturbed together
+# evaluations: number of residual evaluations so far
+
+# Required files:
+# scipy.sparse, only if sparse is set
+
+# Test cases:
+# p0 = np.array([[2],[-1]], dtype=float)
+# myObjectives =  np.array([simpleValleyObjective(p0)], dtype=object)
+# myWeights = np.array([1], dtype=float)
+# myErrorVector = finiteDifferenceJacobian(leastSquaresFeasiblePoint(myObjectives, myWeights), 2)
+# x0 = np.array([[0],[4]], dtype=float)
+# should return
+# myErrorVector.residual(x0) close to [[18]]
+# myErrorVector.jacobian(x0) close to [[0, 12]]
+# A tridiagonal pattern in R**nxn needs 3 groups for every n.
+
+import numpy as np
+
+try:
+    import scipy.sparse as sps # optional, only needed for sparse jacobians
+except ImportError:
+    sps = None
+
+
+def matrnr():
+    # set your matriculation number here
+    matrnr = 23356687
+    return matrnr
+
+
+def columnGroups(pattern):
+    if hasattr(pattern, 'tocsc'): # sparse pattern
+        P = pattern.tocsc() # column access
+        N, n = P.shape # size of the pattern
+        rows = [P.indices[P.indptr[j]:P.indptr[j + 1]] for j in range(n)] # rows of every column
+    else:
+        P = np.asarray(pattern, dtype=bool) # dense pattern
+        N, n = P.shape # size of the pattern
+        rows = [np.flatnonzero(P[:, j]) for j in range(n)] # rows of every column
+    order = np.argsort([-r.shape[0] for r in rows], kind='stable') # largest columns first
+    groups = [] # columns of every group
+    used = [] # rows already covered by every group
+    for j in order: # greedy coloring
+        for g in range(len(groups)): # first group without common row
+            if not np.any(used[g][rows[j]]): # column j is structurally orthogonal to group g
+                groups[g].append(j) # add column to group
+                used[g][rows[j]] = True # mark its rows
+                break
+        else: # no group fits
+            groups.append([j]) # open new group
+            mask = np.zeros(N, dtype=bool) # rows of the new group
+            mask[rows[j]] = True # mark rows of column j
+            used.append(mask) # store rows of the new group
+    return [np.sort(np.array(g, dtype=int)) for g in groups], rows
+
+
+class finiteDifferenceJacobian:
+
+    def __init__(self, R, n, pattern=None, mode='forward', executor=None, sparse=False):
+        if mode != 'forward' and mode != 'central': # check for known difference scheme
+            raise TypeError('mode is wrong!')
+        if sparse and sps is None: # sparse jacobians are built with scipy
+            raise ImportError('sparse jacobians require scipy!')
+        if pattern is None and hasattr(R, 'sparsityPattern'): # error vector knows its pattern
+            pattern = R.sparsityPattern(n) # pattern from the supports of R
+        self.R = R # wrapped error vector
+        self.n = n # dimension of the parameter space
+        self.mode = mode # difference scheme
+        self.executor = executor # optional executor for the perturbed residuals
+        self.sparse = sparse # return jacobian as CSR matrix
+        if pattern is None: # dense jacobian
+            self.groups = [np.array([j]) for j in range(n)] # every column is its own group
+            self.rows = None # every column has entries in all rows
+        else:
+            self.groups, self.rows = columnGroups(pattern) # structurally orthogonal column groups and rows of every column
+        self.evaluations = 0 # counter for residual evaluations
+        self.lastX = None # point of the last residual evaluation
+        self.lastR = None # residual at lastX, reused by the forward scheme
+
+    def residual(self, x: np.array):
+        self.evaluations += 1 # count evaluation
+        self.lastX = x.copy() # remember point
+        self.lastR = self.R.residual(x) # remember residual
+        return self.lastR
+
+    def jacobian(self, x: np.array):
+        return self.residualAndJacobian(x, self.mode == 'forward')[1]
+
+    def residualAndJacobian(self, x: np.array, withResidual=True):
+        h = (np.finfo(float).eps ** (1 / 2 if self.mode == 'forward' else 1 / 3)) * (1 + np.abs(x)) # step per component
+        points = [] # perturbed points
+        for group in self.groups: # one direction per group
+            e = np.zeros_like(x, dtype=float) # perturbation of this group
+            e[group] = h[group] # perturb all columns of the group at once
+            points.append(x + e) # forward point
+            if self.mode == 'central': # central scheme needs the backward point
+                points.append(x - e) # backward point
+        needResidual = withResidual or self.mode == 'forward' # residual at x needed
+        known = needResidual and self.lastX is not None and np.array_equal(x, self.lastX) # residual at x known from residual()
+        if needResidual and not known: # residual at x has to be evaluated
+            points.append(x) # unperturbed point last
+        if self.executor is None: # no executor given
+            values = [self.R.residual(xp) for xp in points] # evaluate one after another
+        else:
+            values = list(self.executor.map(self.R.residual, points)) # evaluate concurrently
+        self.evaluations += len(points) # count evaluations
+        r = self.lastR if known else (values[-1] if needResidual else None) # residual at x
+        N = values[0].shape[0] # number of residuals
+        data, rowIdx, colIdx = [], [], [] # entries with row and column indices for the sparse jacobian
+        J = None if self.sparse else np.zeros((N, self.n)) # dense jacobian
+        for i, group in enumerate(self.groups): # evaluate differences of every group
+            if self.mode == 'forward': # forward scheme
+                diff = np.ravel(values[i] - r) # change of all residuals
+                scale = 1.0 # difference over one step
+            else:
+                diff = np.ravel(values[2 * i] - values[2 * i + 1]) # change of all residuals
+                scale = 2.0 # difference over two steps
+            for j in group: # split the change onto the columns of the group
+                rows = np.arange(N) if self.rows is None else self.rows[j] # rows of column j
+                column = diff[rows] / (scale * h[j, 0]) # difference quotient of column j
+                if self.sparse: # collect sparse column
+                    data.append(column) # entries of column j
+                    rowIdx.append(rows) # rows of the entries
+                    colIdx.append(np.full(rows.shape[0], j)) # column of the entries
+                else:
+                    J[rows, j] = column # store column j
+        if self.sparse: # assemble sparse jacobian
+            J = sps.csr_matrix((np.concatenate(data), (np.concatenate(rowIdx), np.concatenate(colIdx))), shape=(N, self.n)) # jacobian in CSR format
+        return r, J
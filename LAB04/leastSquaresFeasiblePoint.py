@@ -2,17 +2,33 @@
 # Least squares feasible point
 
 # Purpose: Provides .residual() and .jacobian() of the least squares mapping x -> 0.5*sum_k (p_k*h_k(x))**2
+# All quadraticObjective constraints are collected in one group at construction and evaluated together with stacked
+# matrix products, the remaining constraints are evaluated one by one or, if an executor is given, concurrently in chunks.
+# Only exact quadraticObjective instances are grouped, subclasses keep their own .objective() and .gradient().
+# A, b and c of the grouped constraints are copied at construction, later changes to them are not seen.
 
 # Input Definition:
 # hArray: N-dimensional array with objective classes mapping R**n->R with methods .objective() and .gradient(), equality constraints
 # p: column vector in R**N, weights for the constraints
+# executor: optional concurrent.futures executor, evaluates the non-quadratic constraints concurrently. With a process
+# pool the constraints and x are pickled, so the constraint classes must be defined at module level. Default value: None
+# chunkSize: positive integer, number of constraints handed to one task of the executor. Default value: None, then the
+# constraints are split into about 4 chunks per CPU core
+# sparse: bool, if set to true, jacobian() returns a scipy.sparse CSR matrix that only stores the entries of every row
+# in the support of its constraint. A constraint declares its support by an attribute .support with the indices of the
+# variables it depends on, constraints without it depend on all variables. The support of a quadraticObjective is read
+# from the nonzero pattern of A and b. Requires scipy. Default value: False
 
 # Output Definition:
 # residual(): column vector in R**N, the k-th entry is p[k]*h[k](x)
-# jacobian(): matrix in R**Nxm, the [k,j]-th entry returns: partial derivative with respect to x_j of (p[k]*h[k](x))
+# jacobian(): matrix in R**Nxm, the [k,j]-th entry returns: partial derivative with respect to x_j of (p[k]*h[k](x)),
+# CSR matrix if sparse is set
+# residualAndJacobian(): residual() and jacobian() from one pass over the constraints
+# sparsityPattern(n): boolean matrix in R**Nxn, true where the jacobian may be nonzero according to the supports
 
 # Required files:
-# <none>
+# quadraticObjective.py, only used to recognize quadratic constraints
+# scipy.sparse, only if sparse is set
 
 # Test cases:
 # p0 = np.array([[2],[-1]], dtype=float)
@@ -23,8 +39,19 @@
 # should return
 # myErrorVector.residual(x0) close to [[18]]
 # myErrorVector.jacobian(x0) = [[0, 12]]
+# with ProcessPoolExecutor() as pool:
+#     myErrorVector = leastSquaresFeasiblePoint(myObjectives, myWeights, pool)
+#     myErrorVector.residual(x0)
+# should return the same values
 
 import numpy as np
+import os
+import quadraticObjective as QO
+
+try:
+    import scipy.sparse as sps # optional, only needed for sparse jacobians
+except ImportError:
+    sps = None
 
 
 def matrnr():
@@ -33,31 +60,99 @@ def matrnr():
     return matrnr
 
 
+def evaluateConstraints(task):
+    hList, supports, x, withValues, withGradients = task # unpack one chunk of constraints
+    values = np.array([np.ravel(h.objective(x))[0] for h in hList]) if withValues else None # evaluate the constraint functions h[k](x)
+    gradients = [np.ravel(h.gradient(x))[support] for h, support in zip(hList, supports)] if withGradients else None # gradient entries in the supports
+    return values, gradients
+
+
 class leastSquaresFeasiblePoint:
 
-    def __init__(self, hArray:np.array, p: np.array):
+    def __init__(self, hArray:np.array, p: np.array, executor=None, chunkSize=None, sparse=False):
+        if chunkSize is not None and chunkSize < 1: # check for positive chunkSize
+            raise TypeError('range of chunkSize is wrong!')
+        if sparse and sps is None: # sparse jacobians are built with scipy
+            raise ImportError('sparse jacobians require scipy!')
         self.hArray = hArray # array storing all constraints
         self.p = p # weights for the constraints
         self.N = hArray.shape[0] # number of constraints
+        self.weights = np.ravel(p).astype(float) # weights as flat array
+        self.sparse = sparse # return jacobian as CSR matrix
+        self.quadIndex = np.array([k for k in range(self.N) if type(hArray[k]) is QO.quadraticObjective], dtype=int) # quadratic constraints, subclasses may override the formula
+        self.otherIndex = np.setdiff1d(np.arange(self.N), self.quadIndex) # all other constraints
+        self.executor = executor # optional executor for the other constraints
+        if chunkSize is None: # choose chunks for the available cores
+            chunkSize = max(1, int(np.ceil(self.otherIndex.shape[0] / (4 * (os.cpu_count() or 1))))) # about 4 chunks per core
+        self.chunks = [self.otherIndex[i:i + chunkSize] for i in range(0, self.otherIndex.shape[0], chunkSize)] # index chunks
+        self.supports = [None] * self.N # variable indices every constraint depends on, None means all
+        if self.quadIndex.shape[0] > 0: # stack data of the quadratic group
+            self.quadA = np.stack([hArray[k].A for k in self.quadIndex]).astype(float) # system matrices, shape Gxnxn
+            self.quadB = np.stack([np.ravel(hArray[k].b) for k in self.quadIndex]).astype(float) # linear parts, shape Gxn
+            self.quadC = np.array([float(np.ravel(hArray[k].c)[0]) for k in self.quadIndex]) # constant parts, shape G
+            for i, k in enumerate(self.quadIndex): # gradient A_k@x + b_k vanishes outside the nonzero rows of A_k and b_k
+                self.supports[k] = np.flatnonzero(np.any(self.quadA[i] != 0, axis=1) | (self.quadB[i] != 0)) # nonzero pattern
+        for k in self.otherIndex: # declared supports of the other constraints
+            support = getattr(hArray[k], 'support', None) # declared support, if any
+            self.supports[k] = None if support is None else np.ravel(np.asarray(support, dtype=int)) # store as index array
+
+    def support(self, k, n):
+        return np.arange(n) if self.supports[k] is None else self.supports[k] # support of constraint k in R**n
+
+    def sparsityPattern(self, n):
+        pattern = np.zeros((self.N, n), dtype=bool) # no dependencies
+        for k in range(self.N): # one row per constraint
+            pattern[k, self.support(k, n)] = True # variables constraint k depends on
+        return pattern
+
+    def evaluate(self, x: np.array, withValues, withGradients):
+        n = x.shape[0] # dimension of the domain
+        values = np.zeros(self.N) if withValues else None # constraint values h[k](x)
+        gradients = [None] * self.N if withGradients else None # gradient entries of every constraint in its support
+        if self.quadIndex.shape[0] > 0: # quadratic group
+            xf = np.ravel(x) # point as flat array
+            Ax = self.quadA @ xf # all products A_k @ x in one stacked product, shape Gxn
+            if withValues: # values are requested
+                values[self.quadIndex] = 0.5 * (Ax @ xf) + self.quadB @ xf + self.quadC # all quadratic values
+            if withGradients: # gradients are requested
+                quadGradients = Ax + self.quadB # all quadratic gradients as rows
+                for i, k in enumerate(self.quadIndex): # store gradient entries in the supports
+                    gradients[k] = quadGradients[i, self.support(k, n)] # entries of the k-th gradient
+        tasks = [([self.hArray[k] for k in chunk], [self.support(k, n) for k in chunk], x, withValues, withGradients) for chunk in self.chunks] # one task per chunk
+        if self.executor is None: # no executor given
+            results = [evaluateConstraints(task) for task in tasks] # evaluate chunks one after another
+        else:
+            results = list(self.executor.map(evaluateConstraints, tasks)) # evaluate chunks concurrently
+        for chunk, (chunkValues, chunkGradients) in zip(self.chunks, results): # assemble results in constraint order
+            if withValues: # values are requested
+                values[chunk] = chunkValues # store values of this chunk
+            if withGradients: # gradients are requested
+                for k, g in zip(chunk, chunkGradients): # loop over constraints of this chunk
+                    gradients[k] = g # store gradient entries of this constraint
+        return values, gradients
+
+    def assembleJacobian(self, gradients, n):
+        if not self.sparse: # dense jacobian
+            myJacobian = np.zeros((self.N, n)) # initialize jacobian matrix as zero matrix
+            for k in range(self.N): # one row per constraint
+                myJacobian[k, self.support(k, n)] = self.weights[k] * gradients[k] # multiply gradient by weight p[k] and store as k-th row
+            return myJacobian
+        counts = np.array([gradients[k].shape[0] for k in range(self.N)]) # stored entries per row
+        indptr = np.concatenate(([0], np.cumsum(counts))) # row pointers of the CSR format
+        indices = np.concatenate([self.support(k, n) for k in range(self.N)]) if self.N > 0 else np.zeros(0, dtype=int) # column indices
+        data = np.concatenate([self.weights[k] * gradients[k] for k in range(self.N)]) if self.N > 0 else np.zeros(0) # weighted entries
+        return sps.csr_matrix((data, indices, indptr), shape=(self.N, n)) # sparse jacobian, memory scales with the entries
 
     def residual(self, x: np.array):
-        myResidual = np.zeros((self.N, 1)) # initialize residual vector as zero vector
-        
-        # INCOMPLETE CODE STARTS, DO NOT FORGET TO WRITE A COMMENT FOR EACH LINE YOU WRITE
-        for k in range(self.N):                                     # iterate through all N constraints
-            constraint_value = self.hArray[k].objective(x)          # evaluate the k-th constraint function h[k](x)
-            myResidual[k, 0] = self.p[k] * constraint_value         # multiply by weight p[k] and store in residual vector
-        # INCOMPLETE CODE ENDS
-
+        values, _ = self.evaluate(x, True, False) # constraint values only
+        myResidual = (self.weights * values).reshape(self.N, 1) # multiply by weights p[k] and store in residual vector
         return myResidual
 
     def jacobian(self, x: np.array):
-        myJacobian = np.zeros((self.N, x.shape[0])) # initialize jacobian matrix as zero matrix
-
-        # INCOMPLETE CODE STARTS, DO NOT FORGET TO WRITE A COMMENT FOR EACH LINE YOU WRITE
-        for k in range(self.N):                                     # iterate through all N constraints
-            gradient_k = self.hArray[k].gradient(x)                 # compute gradient of k-th constraint function
-            myJacobian[k, :] = (self.p[k] * gradient_k).flatten()   # multiply gradient by weight p[k] and store as k-th row
-        # INCOMPLETE CODE ENDS
+        _, gradients = self.evaluate(x, False, True) # constraint gradients only
+        return self.assembleJacobian(gradients, x.shape[0])
 
-        return myJacobian
+    def residualAndJacobian(self, x: np.array):
+        values, gradients = self.evaluate(x, True, True) # values and gradients in one pass
+        myResidual = (self.weights * values).reshape(self.N, 1) # weighted residual vector
+        return myResidual, self.assembleJacobian(gradients, x.shape[0])
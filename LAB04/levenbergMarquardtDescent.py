@@ -2,20 +2,37 @@
 # Levenberg-Marquardt descent
 
 # Purpose: Find pmin to satisfy norm(jacobian_R.T @ R(pmin))<=eps
+# Iteration: p_k = p_k + d_k if the step reduces norm(R), d_k solves (J.T@J + alpha_k*I) d_k = -J.T@R(p_k).
+# With damping='gain', alpha_k is adapted to the gain ratio of actual and predicted reduction (Nielsen) and carried
+# over accepted steps. With damping='classic', alpha_k is reset to alpha0 after every accepted step.
 
 # Input Definition:
-# R: error vector class with methods .residual() and .jacobian()
+# R: error vector class with methods .residual() and .jacobian(), optionally .residualAndJacobian() for the start
 # p0: column vector in R**n (parameter point), starting point.
 # eps: positive value, tolerance for termination. Default value: 1.0e-4.
 # alpha0: positive value, starting value for damping. Default value: 1.0e-3.
-# beta: positive value bigger than 1, scaling factor for alpha. Default value: 100.
+# beta: positive value bigger than 1, scaling factor for alpha after rejected steps. For damping='gain' the factor
+# starts at 2, doubles with every further rejection and is capped by beta. Default value: 100.
 # verbose: bool, if set to true, verbose information is displayed.
+# damping: 'gain' or 'classic', update rule for alpha as described above. Default value: 'gain'.
+# linearSolver: method for the damped subproblem. 'cg' solves (J.T@J + alpha*I) d = -J.T@r with PrecCGSolver,
+# 'qr' solves min norm([J; sqrt(alpha)*I] d + [r; 0]) with a QR decomposition, which avoids squaring the condition of J,
+# 'eig' decomposes J.T@J = V@diag(s)@V.T once per p, so every further alpha after a rejected step only costs
+# d = -V@((V.T@J.T@r)/(s+alpha)), 'sparse' forms J.T@J as scipy.sparse matrix once per p and solves with a sparse
+# direct solver, 'lsqr' solves the damped least squares problem with scipy's LSQR using only products with J and J.T.
+# Sparse jacobians (e.g. from leastSquaresFeasiblePoint with sparse set) are converted to dense matrices for 'cg', 'qr'
+# and 'eig' and should be used with 'sparse' or 'lsqr'. Default value: 'cg'.
+# broyden: integer, if bigger than 0, J is updated after accepted steps with Broyden's rank-one formula
+# J = J + (R(p_new) - R(p) - J@d) @ d.T / (d.T@d) instead of calling .jacobian(). The exact Jacobian is evaluated again
+# after broyden steps, after a step with gain ratio below 0.25, after a rejected step and before termination.
+# Sparse jacobians become dense by the update. Default value: 0 (exact Jacobian after every accepted step)
 
 # Output Definition:
 # pmin: column vector in R**n (parameter point)
 
 # Required files:
-# d = PrecCGSolver(A,b) from PrecCGSolver.py
+# d = PrecCGSolver(A,b) from PrecCGSolver.py (only for linearSolver='cg')
+# scipy.sparse (only for linearSolver='sparse' or 'lsqr')
 
 # Test cases:
 # p0 = np.array([[180],[0]], dtype=float)
@@ -32,6 +49,12 @@
 import numpy as np
 import PrecCGSolver as PCG
 
+try:
+    import scipy.sparse as sps # optional, only needed for sparse solvers
+    import scipy.sparse.linalg as spla
+except ImportError:
+    sps = None
+
 
 def matrnr():
     # set your matriculation number here
@@ -39,7 +62,7 @@ def matrnr():
     return matrnr
 
 
-def levenbergMarquardtDescent(R, p0: np.array, eps=1.0e-4, alpha0=1.0e-3, beta=100, verbose=0):
+def levenbergMarquardtDescent(R, p0: np.array, eps=1.0e-4, alpha0=1.0e-3, beta=100, verbose=0, damping='gain', linearSolver='cg', broyden=0):
     if eps <= 0: # check for positive eps
         raise TypeError('range of eps is wrong!')
 
@@ -49,6 +72,18 @@ def levenbergMarquardtDescent(R, p0: np.array, eps=1.0e-4, alpha0=1.0e-3, beta=1
     if beta <= 1: # check for sufficiently large beta
         raise TypeError('range of beta is wrong!')
 
+    if damping not in ('gain', 'classic'): # check for known damping strategy
+        raise TypeError('damping is wrong!')
+
+    if linearSolver not in ('cg', 'qr', 'eig', 'sparse', 'lsqr'): # check for known linear solver
+        raise TypeError('linearSolver is wrong!')
+
+    if broyden < 0: # check for nonnegative broyden
+        raise TypeError('range of broyden is wrong!')
+
+    if linearSolver in ('sparse', 'lsqr') and sps is None: # sparse solvers are taken from scipy
+        raise ImportError('linearSolver ' + linearSolver + ' requires scipy!')
+
     if verbose: # print information
         print('Start levenbergMarquardtDescent...') # print start
 
@@ -58,41 +93,106 @@ def levenbergMarquardtDescent(R, p0: np.array, eps=1.0e-4, alpha0=1.0e-3, beta=1
 
     p = p0                                                          # initialize p with starting point
     alpha = alpha0                                                  # initialize damping parameter alpha
-    J = R.jacobian(p)                                               # compute Jacobian at current p
-    r = R.residual(p)                                               # compute residual at current p
-    grad = J.T @ r                                                  # compute gradient of the objective
-    grad_norm = np.linalg.norm(grad)                                # compute norm of the gradient
-
-    while grad_norm > eps:
+    nu = 2.0                                                        # growth factor of alpha after a rejected step
+    n = p.shape[0]                                                  # dimension of the parameter space
+
+    def prepareJacobian(J):                                         # Jacobian in the format of the linear solver and J.T@J
+        if linearSolver == 'sparse':                                # sparse normal equation
+            J = sps.csr_matrix(J)                                   # keeps sparse input, converts dense input
+            return J, (J.T @ J).tocsc()                             # sparse Gauss-Newton matrix
+        if linearSolver == 'lsqr':                                  # only products with J are needed
+            return J, None                                          # no Gauss-Newton matrix
+        if hasattr(J, 'toarray'):                                   # sparse input for a dense solver
+            J = J.toarray()                                         # convert to dense matrix
+        return J, J.T @ J                                           # dense Gauss-Newton matrix
+
+    if hasattr(R, 'residualAndJacobian'):                           # error vector evaluates both in one pass
+        r, J = R.residualAndJacobian(p)                             # compute residual and Jacobian at current p
+    else:
         J = R.jacobian(p)                                           # compute Jacobian at current p
         r = R.residual(p)                                           # compute residual at current p
-        grad = J.T @ r                                              # compute gradient of the objective
-        grad_norm = np.linalg.norm(grad)                            # compute norm of the gradient
+    countJacobian = 1                                               # counter for exact Jacobian evaluations
+    stale = 0                                                       # number of Broyden updates since the last exact Jacobian
+    modelChanged = True                                             # J or r changed, derived quantities need an update
+
+    while True:
+        if modelChanged:                                            # J or r changed since the last step computation
+            J, JTJ = prepareJacobian(J)                             # Gauss-Newton matrix, reused while p does not change
+            grad = J.T @ r                                          # compute gradient of the objective
+            grad_norm = np.linalg.norm(grad)                        # compute norm of the gradient
+            if linearSolver == 'eig':                               # factorize once per p
+                eigVals, V = np.linalg.eigh(JTJ)                    # eigenvalues and eigenvectors of J.T@J
+                Vgrad = V.T @ grad                                  # gradient in the eigenvector basis
+            modelChanged = False                                    # derived quantities are up to date
+            if grad_norm <= eps:                                    # termination condition
+                if stale == 0:                                      # gradient is computed with the exact Jacobian
+                    break                                           # exit loop if gradient norm is small enough
+                J = R.jacobian(p)                                   # confirm termination with the exact Jacobian
+                countJacobian += 1                                  # count exact Jacobian evaluation
+                stale = 0                                           # Jacobian is exact again
+                modelChanged = True                                 # recompute gradient
+                continue                                            # check termination again
 
         if verbose:                                                 # print current iteration and gradient norm
             print(f"Iter {countIter}: ||grad|| = {grad_norm}, alpha = {alpha}")
 
-        if grad_norm <= eps:                                        # check termination criteria
-            break                                                   # exit loop if gradient norm is small enough
-
-        A = J.T @ J + alpha * np.eye(p.shape[0])                    # build the A matrix
-        b = -grad                                                   # right-hand side for LM step
-
-        d = PCG.PrecCGSolver(A, b)                                  # solve for step direction using preconditioned CG
+        if linearSolver == 'cg':                                    # iterative solution of the normal equation
+            A = JTJ + alpha * np.eye(n)                             # build the A matrix
+            b = -grad                                               # right-hand side for LM step
+            d = PCG.PrecCGSolver(A, b)                              # solve for step direction using preconditioned CG
+        elif linearSolver == 'qr':                                  # damped least squares problem via QR
+            Q, Rq = np.linalg.qr(np.vstack((J, np.sqrt(alpha) * np.eye(n)))) # QR decomposition of the augmented matrix
+            rhs = -Q.T @ np.vstack((r, np.zeros((n, 1))))           # project augmented residual
+            d = np.linalg.solve(Rq, rhs)                            # solve triangular system for the step
+        elif linearSolver == 'sparse':                              # sparse direct solution of the normal equation
+            A = JTJ + alpha * sps.identity(n, format='csc')         # build the sparse A matrix
+            d = spla.spsolve(A, -np.ravel(grad)).reshape(n, 1)      # solve for step direction
+        elif linearSolver == 'lsqr':                                # damped least squares problem via LSQR
+            d = spla.lsqr(J, -np.ravel(r), damp=np.sqrt(alpha), atol=1.0e-12, btol=1.0e-12)[0].reshape(n, 1) # step from products with J and J.T
+        else:
+            d = -V @ (Vgrad / (np.maximum(eigVals, 0).reshape(-1, 1) + alpha)) # step from the stored eigen decomposition
 
         p_new = p + d                                               # update the point
         r_new = R.residual(p_new)                                   # compute new residual for the updated point
-        if ((r_new.T @ r_new) < (r.T @ r)):
-            p = p + d                                               # update p
-            alpha = alpha0                                          # Reset damping
+        actual = 0.5 * float(r.T @ r - r_new.T @ r_new)             # actual reduction of 0.5*norm(R)**2
+        Jd = J @ d                                                  # linearized change of the residual
+        predicted = -float(grad.T @ d) - 0.5 * float(Jd.T @ Jd)     # reduction predicted by the linearized model
+        gain = actual / predicted if predicted > 0 else 0.0         # gain ratio of actual and predicted reduction
+        if actual > 0:                                              # step reduces the residual
+            if broyden > 0 and stale < broyden - 1 and gain >= 0.25: # model is still good, update J cheaply
+                if hasattr(J, 'toarray'):                           # rank-one update fills the matrix
+                    J = J.toarray()                                 # convert to dense matrix
+                J = J + ((r_new - r - Jd) @ d.T) / float(d.T @ d)   # Broyden rank-one update from the step and the residual change
+                stale += 1                                          # count updates since the last exact Jacobian
+            else:
+                J = R.jacobian(p_new)                               # Jacobian changes only with p
+                countJacobian += 1                                  # count exact Jacobian evaluation
+                stale = 0                                           # Jacobian is exact
+            p = p_new                                               # update p
+            r = r_new                                               # residual at the new p is known from the test
+            modelChanged = True                                     # recompute gradient and Gauss-Newton matrix
+            if damping == 'gain':                                   # adapt alpha to the quality of the model
+                alpha = alpha * np.max((1 / 3, 1 - (2 * gain - 1) ** 3)) # less damping if the model was good, more if it was poor
+                nu = 2.0                                            # reset growth factor
+            else:
+                alpha = alpha0                                      # Reset damping
             countIter += 1                                          # Only increment when step accepted
+        elif stale > 0:                                             # rejection may be caused by the approximate Jacobian
+            J = R.jacobian(p)                                       # refresh Jacobian at the same p
+            countJacobian += 1                                      # count exact Jacobian evaluation
+            stale = 0                                               # Jacobian is exact
+            modelChanged = True                                     # retry with the same alpha and the exact model
+        elif damping == 'gain':
+            alpha = nu * alpha                                      # increase damping, keep same p
+            nu = np.min((2 * nu, beta))                             # grow faster after repeated rejections
         else:
             alpha = beta * alpha                                    # increase damping, keep same p
 
     # INCOMPLETE CODE ENDS
 
     if verbose: # print information
-        gradp = R.jacobian(p).T @ R.residual(p) # store final gradient
-        print('levenbergMarquardtDescent terminated after ', countIter, ' steps with norm of gradient =', np.linalg.norm(gradp)) # print termination and gradient information
+        print('levenbergMarquardtDescent terminated after ', countIter, ' steps with norm of gradient =', grad_norm) # print termination and gradient information
+        if broyden > 0: # Jacobian updates were used
+            print('levenbergMarquardtDescent evaluated the exact Jacobian ', countJacobian, ' times') # print number of exact Jacobians
 
     return p
@@ -23,17 +23,20 @@ class multidimensionalObjective:
     # p: vector in R (parameter space)
 
     # Input Definition:
-    # x: vector in R**8 (domain space)
+    # x: vector in R**8 (domain space) or matrix in R**8xk (k points as columns) for objective and gradient
 
     # Output Definition:
-    # objective: real number, evaluation of nonlinearObjective at x
-    # gradient: real column vector in R**8, evaluation of the gradient with respect to x at x
+    # objective: 1xk array, evaluation of nonlinearObjective at every column of x
+    # gradient: real matrix in R**8xk, evaluation of the gradient with respect to x at every column of x
     # hessian: real 8x8 matrix, evaluation of the hessian with respect to x at x
+    # hessianVectorProduct: hessian at x times v without forming the hessian, v in R**8 or R**8xk
     # setParameters(): sets p
     # parameterGradient(): vector in R**1, evaluation of gradient wrt p
 
     # Test cases:
 
+    supportsBatch = True # objective and gradient accept many points as columns
+
     def __init__(self, p=1):
         self.p = p # parameter of the function
         self.A = np.array(
@@ -44,13 +47,15 @@ class multidimensionalObjective:
         self.b = np.array([[10], [3], [1], [0], [0], [0], [0], [0]]) # linear part 
 
     def objective(self, x: np.array):
-        tau = 0.5 * x.T @ self.A @ x + 1 # store denominator
-        value = 0.5 * x.T @ self.A @ x - self.b.T @ x + self.p / tau # compose function from parts
+        quad = 0.5 * np.sum(x * (self.A @ x), axis=0) # quadratic part, one value per column
+        tau = quad + 1 # store denominator
+        value = quad - self.b.T @ x + self.p / tau # compose function from parts
         return value
 
     def gradient(self, x: np.array):
-        tau = 0.5 * x.T @ self.A @ x + 1 # store denominator
-        g = self.A @ x - self.b - self.p / (tau ** 2) * (self.A @ x) # gradient via chain rule
+        Ax = self.A @ x # matrix times all columns
+        tau = 0.5 * np.sum(x * Ax, axis=0) + 1 # store denominator, one value per column
+        g = Ax - self.b - self.p / (tau ** 2) * Ax # gradient via chain rule, column j scaled with its own denominator
         return g
 
     def hessian(self, x: np.array):
@@ -58,6 +63,12 @@ class multidimensionalObjective:
         h = self.A - self.p / (tau ** 2) * self.A + (2*self.p) / (tau ** 3) * (self.A @ x) @ (self.A @ x).T # hessian via chain rule
         return h
 
+    def hessianVectorProduct(self, x: np.array, v: np.array):
+        tau = 0.5 * x.T @ self.A @ x + 1 # store denominator
+        Ax = self.A @ x # store gradient direction of the denominator
+        hv = (1 - self.p / (tau ** 2)) * (self.A @ v) + (2*self.p) / (tau ** 3) * (Ax @ (Ax.T @ v)) # scaled A times v plus rank-one correction
+        return hv
+
     def setParameters(self, p):
         self.p = p # set parameter
 
@@ -8,11 +8,20 @@
 # x: column vector in R ** n(domain point)
 # h: simplex edge length
 # verbose: bool, if set to true, verbose information is displayed
+# executor: optional concurrent.futures executor (ThreadPoolExecutor or ProcessPoolExecutor with the wanted number of workers),
+# used to evaluate the stencil points concurrently if f does not support batched input. Default value: None
 
 # Output Definition:
 # grad_f_h: simplex gradient
 # stenFail: 0 by default, but 1 if stencil failure shows up
 
+# All 2n stencil points x +- h*e_j are collected as columns of one nx2n matrix (plus x itself for the failure check).
+# If f has the attribute supportsBatch set to true, f.objective() is called once with this matrix and returns all values,
+# otherwise the columns are evaluated one after another or, if an executor is given, concurrently.
+# SUCSGradientAndStencilFailure(f, x, h) returns grad_f_h and stenFail from the same 2n+1 evaluations.
+# SUCSStencil(f, x, h) evaluates the stencil once and keeps the results as attributes:
+# .gradient (simplex gradient), .fCenter (f(x)), .values (2n stencil values, forward points first), .stenFail
+
 # Required files:
 # < none >
 
@@ -24,6 +33,14 @@
 # should return
 # myGradient close to [[0],[0],[0],[0],[0],[0],[0],[0]]
 
+# myGradient, stenFail = SUCSGradientAndStencilFailure(myObjective, x, 1.0e-2)
+# should return
+# myGradient close to [[0],[0],[0],[0],[0],[0],[0],[0]] and stenFail = 1
+
+# myStencil = SUCSStencil(myObjective, x, 1.0e-2)
+# should return
+# myStencil.gradient close to [[0],[0],[0],[0],[0],[0],[0],[0]], myStencil.fCenter close to -4.8370 and myStencil.stenFail = 1
+
 
 import numpy as np
 
@@ -34,26 +51,35 @@ def matrnr():
     return matrnr
 
 
-def SUCSGradient(f, x: np.array, h: float, verbose=0):
+def SUCSStencilValues(f, x: np.array, h: float, withCenter=0, executor=None):
+    n = x.shape[0] # get dimension of the vector x
+    steps = h * np.eye(n) # scaled unit vectors as columns
+    if withCenter: # center is needed for the stencil failure check
+        X = np.hstack((x, x + steps, x - steps)) # center, forward and backward points as nx(2n+1) matrix
+    else:
+        X = np.hstack((x + steps, x - steps)) # forward and backward points as nx2n matrix
+
+    if getattr(f, 'supportsBatch', False): # objective evaluates many points in one call
+        values = np.ravel(f.objective(X)) # all values in one call
+    elif executor is not None: # evaluate the independent points concurrently
+        columns = [X[:, [j]] for j in range(X.shape[1])] # split into single column vectors
+        values = np.array([np.ravel(fj)[0] for fj in executor.map(f.objective, columns)]) # one call per point, in parallel
+    else:
+        values = np.array([np.ravel(f.objective(X[:, [j]]))[0] for j in range(X.shape[1])]) # one call per point
+
+    if withCenter: # split off center value
+        return values[0], values[1:] # center value and 2n stencil values
+    return values # 2n stencil values, forward points first
+
+
+def SUCSGradient(f, x: np.array, h: float, verbose=0, executor=None):
 
     if verbose: # print information
         print('Start SUCSGradient...') # print start
 
-    grad_f_h = x.copy() # initialize simplex gradient of f
-
-    # INCOMPLETE CODE STARTS
-    n = x.shape[0]                                          # get dimension of the vector x
-    grad_f_h = np.zeros_like(x)                             # initialize gradient vector as zero vector
-    
-    for j in range(n):                                      # iterate through all dimensions
-        e_j = np.zeros_like(x)                              # create unit vector e_j
-        e_j[j, 0] = 1.0                                     # set j-th component to 1
-        
-        f_forward = f.objective(x + h * e_j)                # evaluate f at forward simplex point x + h*e_j  
-        f_backward = f.objective(x - h * e_j)               # evaluate f at reflected simplex point x - h*e_j
-        
-        grad_f_h[j, 0] = (f_forward - f_backward) / (2.0 * h)  # compute finite difference gradient component
-    # INCOMPLETE CODE ENDS
+    n = x.shape[0] # get dimension of the vector x
+    values = SUCSStencilValues(f, x, h, 0, executor) # evaluate all stencil points at once
+    grad_f_h = ((values[:n] - values[n:]) / (2.0 * h)).reshape(n, 1) # central difference of forward and backward values
 
     if verbose: # print information
         print('SUCSGradient terminated with gradient =', grad_f_h) # print termination
@@ -61,32 +87,40 @@ def SUCSGradient(f, x: np.array, h: float, verbose=0):
     return grad_f_h
 
 
-def SUCSStencilFailure(f, x: np.array, h: float, verbose=0):
+class SUCSStencil:
+
+    def __init__(self, f, x: np.array, h: float, executor=None):
+        self.x = x # center of the stencil
+        self.h = h # simplex edge length
+        n = x.shape[0] # get dimension of the vector x
+        self.fCenter, self.values = SUCSStencilValues(f, x, h, 1, executor) # evaluate center and all stencil points at once
+        self.gradient = ((self.values[:n] - self.values[n:]) / (2.0 * h)).reshape(n, 1) # central difference of forward and backward values
+        self.stenFail = 0 if np.any(self.values < self.fCenter) else 1 # failure if no stencil point is better than the center
+
+
+def SUCSStencilFailure(f, x: np.array, h: float, verbose=0, executor=None):
 
     if verbose: # print information
         print('Check for SUCSStencilFailure...') # print start of check
 
-    stenFail = 1 # initialize stencil failure with true
-
-    # INCOMPLETE CODE STARTS, DO NOT FORGET TO WRITE A COMMENT FOR EACH LINE YOU WRITE
-    
-    n = x.shape[0]                                          # get dimension of the vector x
-    f_center = f.objective(x)                               # evaluate function at center point x
-    stenFail = 1                                            # initialize stencil failure as true (assume failure)
-    
-    for j in range(n):                                      # iterate through all dimensions
-        e_j = np.zeros_like(x)                              # create unit vector e_j
-        e_j[j, 0] = 1.0                                     # set j-th component to 1
-        
-        f_forward = f.objective(x + h * e_j)                # evaluate f at forward simplex point
-        f_backward = f.objective(x - h * e_j)               # evaluate f at backward simplex point
-        
-        if f_center > f_forward or f_center > f_backward:   # check if center point is not minimal
-            stenFail = 0                                    # no stencil failure found
-            break                                           # exit loop early since we found a point with lower function value
-    # INCOMPLETE CODE ENDS
-    
+    stenFail = SUCSStencil(f, x, h, executor).stenFail # evaluate center and all stencil points at once
+
     if verbose: # print information
         print('SUCSStencilFailure check returns ', stenFail) # print termination
 
     return stenFail
+
+
+def SUCSGradientAndStencilFailure(f, x: np.array, h: float, verbose=0, executor=None):
+
+    if verbose: # print information
+        print('Start SUCSGradientAndStencilFailure...') # print start
+
+    stencil = SUCSStencil(f, x, h, executor) # evaluate center and all stencil points at once
+    grad_f_h = stencil.gradient # simplex gradient
+    stenFail = stencil.stenFail # stencil failure flag
+
+    if verbose: # print information
+        print('SUCSGradientAndStencilFailure terminated with gradient =', grad_f_h, 'and stencil failure', stenFail) # print termination
+
+    return grad_f_h, stenFail
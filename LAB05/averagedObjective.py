@@ -0,0 +1,65 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# averaged objective
+
+# Purpose: Reduces the noise of a stochastic objective by averaging k replicate evaluations at every point.
+# The replicates are evaluated as one batch if the objective supports batched input.
+# The standard error of the mean is available as well, so comparisons can take the remaining noise into account.
+
+# Class parameters:
+# f: objective class with method .objective(), typically with noise
+# replicates: integer bigger than 1, number of evaluations averaged per point. Default value: 4
+
+# Input Definition:
+# x: column vector in R ** n (domain point) or matrix in R ** nxm (m domain points as columns)
+
+# Output Definition:
+# objective(): 1xm array, mean of the replicate values for every column of x
+# objectiveWithError(): 1xm array of means and 1xm array of standard errors of the means
+# stochastic: copied from f, the mean of a noisy objective is still noisy
+
+# Required files:
+# < none >
+
+# Test cases:
+# myObjective = averagedObjective(noisyObjective(), 16)
+# x = np.array([[1.02614],[0],[0],[0],[0],[0],[0],[0]], dtype=float)
+# mean, stdErr = myObjective.objectiveWithError(x)
+# should return mean close to -4.8369 and stdErr close to 0.0002
+
+import numpy as np
+
+
+def matrnr():
+    # set your matriculation number here
+    matrnr = 23356687
+    return matrnr
+
+
+class averagedObjective:
+
+    supportsBatch = True # many points can be handed over as columns of one matrix
+
+    def __init__(self, f, replicates=4):
+        if replicates < 2: # averaging needs at least two samples for an error estimate
+            raise TypeError('range of replicates is wrong!')
+        self.f = f # wrapped objective
+        self.replicates = replicates # number of samples per point
+        self.stochastic = getattr(f, 'stochastic', False) # mean of a noisy objective is noisy as well
+
+    def samples(self, x: np.array):
+        m = x.shape[1] # number of points
+        X = np.repeat(x, self.replicates, axis=1) # every point repeated, replicates of one point are neighbours
+        if getattr(self.f, 'supportsBatch', False): # wrapped objective evaluates many points in one call
+            values = np.ravel(self.f.objective(X)) # all samples in one call
+        else:
+            values = np.array([np.ravel(self.f.objective(X[:, [j]]))[0] for j in range(X.shape[1])]) # one call per sample
+        return values.reshape(m, self.replicates) # one row of samples per point
+
+    def objective(self, x: np.array):
+        return np.mean(self.samples(x), axis=1).reshape(1, -1) # mean per point
+
+    def objectiveWithError(self, x: np.array):
+        values = self.samples(x) # samples of all points
+        mean = np.mean(values, axis=1).reshape(1, -1) # mean per point
+        stdErr = (np.std(values, axis=1, ddof=1) / np.sqrt(self.replicates)).reshape(1, -1) # standard error of the mean per point
+        return mean, stdErr
@@ -0,0 +1,112 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# cached objective
+
+# Purpose: Wraps a deterministic objective and remembers evaluated points, so repeated evaluations at the same point
+# (stencil centers, stencil points revisited after small steps or in later sweeps over the scales) are not recomputed.
+# Points are identified after rounding every component to a grid of width tol. The least recently used entries are
+# dropped once maxSize points are stored.
+
+# Class parameters:
+# f: objective class with method .objective(), must be deterministic
+# tol: positive value, grid width for identifying points. Must be clearly smaller than the smallest distance of
+# points that should be told apart, e.g. the smallest simplex scale. Default value: 1.0e-12
+# maxSize: positive integer, maximal number of stored points. Default value: 100000
+# executor: optional concurrent.futures executor, evaluates uncached points of a batch concurrently. Default value: None
+
+# Input Definition:
+# x: column vector in R ** n (domain point) or matrix in R ** nxk (k domain points as columns)
+
+# Output Definition:
+# objective(): 1xk array with the objective values of all columns of x, evaluated only for points not stored yet
+# hits: number of evaluations answered from the cache
+# misses: number of evaluations passed on to f
+# Points with a component bigger than about 4.6e18*tol in absolute value (or not finite) do not fit the integer grid
+# and are always passed on to f without being stored.
+# Objectives with the attribute stochastic set to true (e.g. noisyObjective) are rejected, since every call of them
+# is a new sample.
+
+# Required files:
+# < none >
+
+# Test cases:
+# myObjective = cachedObjective(multidimensionalObjective(), 1.0e-12)
+# x = np.array([[1],[1],[1],[1],[1],[1],[1],[1]], dtype=float)
+# y = myObjective.objective(x)
+# y = myObjective.objective(x)
+# should return y close to 53.0147 and myObjective.hits = 1, myObjective.misses = 1
+
+import numpy as np
+from collections import OrderedDict
+
+
+def matrnr():
+    # set your matriculation number here
+    matrnr = 23356687
+    return matrnr
+
+
+class cachedObjective:
+
+    supportsBatch = True # many points can be handed over as columns of one matrix
+
+    def __init__(self, f, tol=1.0e-12, maxSize=100000, executor=None):
+        if getattr(f, 'stochastic', False): # values of a stochastic objective must not be reused
+            raise TypeError('stochastic objectives cannot be cached!')
+        if tol <= 0: # check for positive tol
+            raise TypeError('range of tol is wrong!')
+        if maxSize < 1: # check for positive maxSize
+            raise TypeError('range of maxSize is wrong!')
+        self.f = f # wrapped objective
+        self.tol = tol # grid width for identifying points
+        self.maxSize = maxSize # maximal number of stored points
+        self.executor = executor # optional executor for uncached points
+        self.store = OrderedDict() # stored values, least recently used first
+        self.hits = 0 # number of values taken from the store
+        self.misses = 0 # number of values computed by f
+
+    def key(self, x: np.array):
+        grid = np.round(np.ravel(x) / self.tol) # point rounded to the grid
+        if not np.all(np.abs(grid) < 2.0 ** 62): # grid index does not fit into int64 (or is not finite)
+            return None # point cannot be keyed without collisions, it is not cached
+        return grid.astype(np.int64).tobytes() # grid point as hashable key
+
+    def objective(self, x: np.array):
+        k = x.shape[1] # number of points
+        keys = [self.key(x[:, j]) for j in range(k)] # grid key of every point
+        found = {} # values of the points in x, by key
+        missing = [] # indices of points not stored yet, one per key
+        for j in range(k): # loop over points
+            if keys[j] is None: # point outside the range of the grid
+                missing.append(j) # always evaluate it below
+                continue
+            if keys[j] in found: # point occurs twice in x
+                continue # value is known already
+            if keys[j] in self.store: # point already evaluated
+                found[keys[j]] = self.store[keys[j]] # take stored value
+                self.store.move_to_end(keys[j]) # mark as recently used
+                self.hits += 1 # count hit
+            else: # unknown point
+                missing.append(j) # evaluate it below
+                found[keys[j]] = None # reserve key, so repeated points are evaluated once
+
+        if len(missing) > 0: # some points need evaluation
+            X = x[:, missing] # uncached points as columns
+            columns = [X[:, [i]] for i in range(X.shape[1])] # split into single column vectors
+            if getattr(self.f, 'supportsBatch', False): # wrapped objective evaluates many points in one call
+                newValues = np.ravel(self.f.objective(X)) # all values in one call
+            elif self.executor is not None: # evaluate the independent points concurrently
+                newValues = [np.ravel(fj)[0] for fj in self.executor.map(self.f.objective, columns)] # one call per point, in parallel
+            else:
+                newValues = [np.ravel(self.f.objective(xj))[0] for xj in columns] # one call per point
+            self.misses += len(missing) # count misses
+            for j, value in zip(missing, newValues): # store new values
+                if keys[j] is None: # uncacheable point
+                    found[j] = value # value of this point for the output, stored under its column index
+                    continue
+                found[keys[j]] = value # value of this point for the output
+                self.store[keys[j]] = value # remember value of this point
+                if len(self.store) > self.maxSize: # store is full
+                    self.store.popitem(last=False) # drop least recently used point
+
+        values = np.array([found[j if keys[j] is None else keys[j]] for j in range(k)], dtype=float) # values in the order of the columns of x
+        return values.reshape(1, k)
@@ -10,6 +10,20 @@
 # h: column vector in R ** m, scales for filtering
 # eps: positive value, tolerance for termination. Default value: 1.0e-4.
 # verbose: bool, if set to true, verbose information is displayed.
+# executor: optional concurrent.futures executor, evaluates the 2n stencil points of every simplex gradient concurrently.
+# Default value: None
+# workers: integer, if bigger than 1 and no executor is given, a pool with this many workers is created for the run. Default value: 1
+# pool: 'thread' or 'process', kind of pool created for workers > 1. Use 'process' for expensive Python objectives
+# (f must then be picklable) and 'thread' for objectives that release the GIL, e.g. external simulations. Default value: 'thread'
+# cacheTol: positive value or None. If set, objective values are cached for points that agree on a grid of this width
+# and reused across steps, scales and outer loops. Must be smaller than half of the smallest scale in h. Only for
+# deterministic objectives, stochastic ones like noisyObjective are rejected, and cannot be combined with replicates > 1.
+# Default value: None (no cache)
+# cacheSize: positive integer, maximal number of cached points, least recently used points are dropped. Default value: 100000
+# replicates: positive integer, if bigger than 1 every point is evaluated that many times (as one batch if f supports it)
+# and the mean is used. The line search then accepts a step if the sufficient decrease condition holds up to
+# noiseTol standard errors of the difference of trial and center value. Default value: 1 (single evaluations)
+# noiseTol: nonnegative value, number of standard errors tolerated in the line search. Default value: 1.0
 
 # Output Definition:
 # xmin: column vector in R**n (LMP at all scales)
@@ -17,6 +31,10 @@
 # Required files:
 # grad_f_h = SUCSGradient(f, x, h) from SUCSGradient.py
 # isStencilFailure = SUCSStencilFailure(f, x, h) from SUCSGradient.py
+# grad_f_h, isStencilFailure = SUCSGradientAndStencilFailure(f, x, h) from SUCSGradient.py
+# stencil = SUCSStencil(f, x, h) from SUCSGradient.py
+# fc = cachedObjective(f, tol, maxSize, executor) from cachedObjective.py, only if cacheTol is set
+# fa = averagedObjective(f, replicates) from averagedObjective.py, only if replicates > 1
 
 # Test cases:
 # myObjective = noisyObjective()
@@ -27,6 +45,9 @@
 
 import numpy as np
 import SUCSGradient as SUC
+import cachedObjective as CO
+import averagedObjective as AO
+from concurrent.futures import ThreadPoolExecutor, ProcessPoolExecutor
 
 
 def matrnr():
@@ -35,10 +56,32 @@ def matrnr():
     return matrnr
 
 
-def implicitFiltering(f, P, x0: np.array, h: np.array, eps=1.0e-3, verbose=0):
+def implicitFiltering(f, P, x0: np.array, h: np.array, eps=1.0e-3, verbose=0, executor=None, workers=1, pool='thread', cacheTol=None, cacheSize=100000, replicates=1, noiseTol=1.0):
     if eps <= 0: # check for positive eps
         raise TypeError('range of eps is wrong!')
 
+    if pool != 'thread' and pool != 'process': # check for known pool type
+        raise TypeError('pool is wrong!')
+
+    if replicates < 1 or noiseTol < 0: # check for positive replicates and nonnegative noiseTol
+        raise TypeError('range of replicates or noiseTol is wrong!')
+
+    if cacheTol is not None and replicates > 1: # averaging is for noisy objectives, caching for deterministic ones
+        raise TypeError('cacheTol and replicates > 1 cannot be combined!')
+
+    if executor is None and workers > 1: # create a pool for this run
+        poolClass = ThreadPoolExecutor if pool == 'thread' else ProcessPoolExecutor # choose pool type
+        with poolClass(max_workers=workers) as runExecutor: # pool is shut down after the run, also on errors
+            return implicitFiltering(f, P, x0, h, eps, verbose, runExecutor, 1, pool, cacheTol, cacheSize, replicates, noiseTol) # run with the new pool
+
+    if replicates > 1: # average replicate evaluations
+        f = AO.averagedObjective(f, replicates) # mean of replicates with standard error
+
+    if cacheTol is not None: # cache objective values
+        if cacheTol >= 0.5 * np.min(h): # grid must tell stencil points of the smallest scale apart
+            raise TypeError('cacheTol is too big for the scales h!')
+        f = CO.cachedObjective(f, cacheTol, cacheSize, executor) # evaluate every point only once
+
     if verbose: # print information
         print('Start implicitFiltering...') # print start
 
@@ -49,11 +92,18 @@ def implicitFiltering(f, P, x0: np.array, h: np.array, eps=1.0e-3, verbose=0):
         if verbose: # print information
             print('Start SUCSProjectedSteepestDescent...') # print start of subroutine
 
+        def sufficientDecrease(xt: np.array, fCenter, t): # line search acceptance test for trial point xt
+            bound = fCenter - sigma / t * np.linalg.norm(xp - P.project(xp - t * grad_f_h)) ** 2 # required value for sufficient decrease
+            if replicates > 1: # averaged values carry a standard error
+                ft, stdErr = f.objectiveWithError(xt) # mean and standard error at the trial point
+                return ft <= bound + noiseTol * np.sqrt(2) * stdErr # accept unless the violation exceeds the noise of the difference
+            return f.objective(xt) <= bound # plain sufficient decrease condition
+
         n = xk.shape[0] # get dimension of vector
         xp = P.project(xk) # set starting iteration to projected starting point
-        grad_f_h = SUC.SUCSGradient(f, xp, hk) # build simplex gradient
-
-        isStencilFailure = SUC.SUCSStencilFailure(f, xp, hk) # check for stencil failure
+        stencil = SUC.SUCSStencil(f, xp, hk, executor) # evaluate stencil once for gradient, center value and failure check
+        grad_f_h = stencil.gradient # simplex gradient
+        isStencilFailure = stencil.stenFail # check for stencil failure
         loopCounter = 0 # initialize counter of loops
         linesearchFail = 0 # initialize linesearchFail as false
 
@@ -67,7 +117,7 @@ def implicitFiltering(f, P, x0: np.array, h: np.array, eps=1.0e-3, verbose=0):
             d = - beta * grad_f_h # scaled steepest descent
             t = 1 # starting guess for step size
             linesearchCounter = 0 # counts number of linesearch loops
-            while f.objective(xp + t * d) > f.objective(xp) - sigma / t * np.linalg.norm(xp - P.project(xp - t * grad_f_h)) ** 2: # sufficient decrease condition
+            while not sufficientDecrease(xp + t * d, stencil.fCenter, t): # sufficient decrease condition, f(xp) is the stencil center value
                 t = 0.5 * t # update t
                 linesearchCounter += 1 # update counter
                 if linesearchCounter > 10: # terminate after 10 loops
@@ -76,7 +126,9 @@ def implicitFiltering(f, P, x0: np.array, h: np.array, eps=1.0e-3, verbose=0):
 
             xp = P.project(xp + t * d) # project with found t
             loopCounter += 1 # update loop counter
-            isStencilFailure = SUC.SUCSStencilFailure(f, xp, hk) # check for stencil failure
+            stencil = SUC.SUCSStencil(f, xp, hk, executor) # evaluate stencil at the new point
+            grad_f_h = stencil.gradient # simplex gradient at the new point for the next step and the stationarity test
+            isStencilFailure = stencil.stenFail # check for stencil failure
             if isStencilFailure or np.linalg.norm(xp - P.project(xp - grad_f_h)) <= epsk * hk or loopCounter > 10 * n or linesearchFail: # check termination criteria
                 satisfiesTermination = 1 # set termination criterion to true
             else:
@@ -118,6 +170,8 @@ def implicitFiltering(f, P, x0: np.array, h: np.array, eps=1.0e-3, verbose=0):
 
     if verbose: # print information
         print('implicitFiltering terminated after ', countIter, ' outer loops with LMP at all scales = ', xk) # print termination of outer loop
+        if cacheTol is not None: # print cache information
+            print('implicitFiltering cache answered ', f.hits, ' of ', f.hits + f.misses, ' evaluations') # print cache hits
     return xk
 
 
@@ -21,18 +21,29 @@ class noisyObjective:
 
     # Class parameter:
     # p: scalar in R (parameter space)
+    # seed: seed of the instance's own random generator, same seed gives the same noise sequence. Default value: None (random seed)
 
     # Input Definition:
-    # x: vector in R**8 (domain space)
+    # x: vector in R**8 (domain space) or matrix in R**8xk (k points as columns)
 
     # Output Definition:
-    # objective: real number, evaluation of nonlinearObjective at x
+    # objective: 1xk array, evaluation of nonlinearObjective at every column of x, the k noise samples are drawn at once
     # setParameters(): sets p
+    # stochastic: true, every evaluation draws new noise, so values must not be cached
+    # supportsBatch: true, objective accepts many points as columns of one matrix
 
     # Test cases:
+    # myObjective = noisyObjective(1, 42)
+    # X = np.hstack((np.zeros((8, 1)), np.ones((8, 1))))
+    # values = myObjective.objective(X)
+    # should return values close to [[1, 53.0147]], and the same values again for a new noisyObjective(1, 42)
 
-    def __init__(self, p=1):
+    stochastic = True
+    supportsBatch = True
+
+    def __init__(self, p=1, seed=None):
         self.p = p
+        self.rng = np.random.default_rng(seed)
         self.A = np.array(
             [[10, 3, 1, 0, 0, 0, 0, 0], [3, 10, 3, 1, 0, 0, 0, 0], [1, 3, 10, 3, 1, 0, 0, 0],
              [0, 1, 3, 10, 3, 1, 0, 0],
@@ -41,9 +52,10 @@ class noisyObjective:
         self.b = np.array([[10], [3], [1], [0], [0], [0], [0], [0]])
 
     def objective(self, x: np.array):
-        noise = 0.001 * np.sin(6.28318 * np.random.random())
-        tau = 0.5 * x.T @ self.A @ x + 1
-        value = 0.5 * x.T @ self.A @ x - self.b.T @ x + self.p / tau + noise
+        noise = 0.001 * np.sin(6.28318 * self.rng.random(x.shape[1]))
+        quad = 0.5 * np.sum(x * (self.A @ x), axis=0)
+        tau = quad + 1
+        value = (quad - self.b.T @ x + self.p / tau + noise).reshape(1, -1)
         return value
 
     def setParameters(self, p):
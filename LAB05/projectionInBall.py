@@ -6,12 +6,18 @@
 # Class parameters:
 # origin: column vector in R ** n.
 # radius: positive scalar, radius of the ball
+# eps: positive scalar, tolerance for the activity of the constraint. Default value: 1.0e-6
 
 # Input Definition:
-# x: column vector in R ** n(domain space)
+# x: column vector in R ** n(domain space) or matrix in R ** nxk (k points as columns, projected in one vectorized call)
 
 # Output Definition:
-# projectedX: column vector in R ** n, satisfies constraint
+# projectedX: column vector in R ** n or matrix in R ** nxk, satisfies constraint for every column
+# onBoundary(x): boolean array in R ** k, true for every column with | ||x-origin|| - radius | <= eps
+# activeIndexSet(x): list of eps-active indexes as in projectionInBox. The ball has no coordinate bounds, so the list is
+# empty in the interior. On the boundary it contains the indexes of the coordinates along which the outer normal
+# x-origin points (|x_i-origin_i| > eps), so projected descent methods treat these directions as blocked.
+# sample(m, rng): matrix in R ** nxm, m points drawn uniformly from the ball as columns. rng is an optional numpy Generator.
 
 # Required files:
 # < none >
@@ -25,6 +31,10 @@
 # myBall.project(x) should return [[2.414], [2.414]]
 # y = np.array([[2.2], [2.2]], dtype=float)
 # myBall.project(y) should return [[2.2], [2.2]]
+# myBall.project(np.hstack((x, y))) should return [[2.414, 2.2], [2.414, 2.2]]
+# myBall.onBoundary(myBall.project(x)) should return [True]
+# myUnitBall = projectionInBall(np.array([[0], [0]]), 1)
+# myUnitBall.project(np.array([[4], [4]])) should return [[0.707], [0.707]], also for integer input
 
 import numpy as np
 
@@ -37,21 +47,38 @@ def matrnr():
 
 class projectionInBall:
   
-    def __init__(self, origin: np.array, radius):
+    def __init__(self, origin: np.array, radius, eps=1.0e-6):
         self.origin = origin
         self.radius = radius
+        self.eps = eps # eps for tolerance
         if radius <= 0:
             raise TypeError('radius is not positive.')
         
     def project(self, x: np.array):
+        D = x - self.origin # differences to the origin, one column per point
+        myNorm = np.linalg.norm(D, axis=0) # distance of every column to the origin
+        outside = myNorm > self.radius # columns that violate the constraint
+        projectedX = x.astype(float) # feasible columns stay unchanged, float copy so integer input is not truncated
+        projectedX[:, outside] = self.origin + self.radius / myNorm[outside] * D[:, outside] # scale violating columns onto the sphere
+        return projectedX
 
-        myNorm = np.linalg.norm(x-self.origin)
+    def onBoundary(self, x: np.array):
+        myNorm = np.linalg.norm(x - self.origin, axis=0) # distance of every column to the origin
+        return np.abs(myNorm - self.radius) <= self.eps # eps-active columns
 
-        if myNorm <= self.radius:
-            projectedX = x
-        else:
-            projectedX = self.origin + self.radius / myNorm * (x - self.origin)
+    def activeIndexSet(self, x: np.array):
+        if not self.onBoundary(x)[0]: # interior point
+            return [] # no index is active
+        return list(np.flatnonzero(np.abs(np.ravel(x - self.origin)) > self.eps)) # coordinates of the outer normal
 
-        return projectedX
+    def sample(self, m: int, rng=None):
+        if rng is None: # no generator handed over
+            rng = np.random.default_rng() # use a freshly seeded one
+        n = self.origin.shape[0] # get vector dimension
+        directions = rng.standard_normal((n, m)) # directions with rotation invariant distribution
+        directions = directions / np.linalg.norm(directions, axis=0) # normalize directions
+        radii = self.radius * rng.random(m) ** (1 / n) # radii such that points are uniform in the volume
+        X = self.origin + directions * radii # uniform points in the ball as columns
+        return X
     
 
@@ -0,0 +1,61 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# projection in halfspace constraints
+
+# Purpose: if x violates c.T @ x <= d, then it is projected to xp = x - (c.T @ x - d)/(c.T @ c) * c
+
+# Class parameters:
+# c: column vector in R ** n, normal of the halfspace, must not be zero
+# d: scalar, offset of the halfspace
+# eps: nonnegative value, tolerance for accepting being active. Default value: 1.0e-6.
+
+# Input Definition:
+# x: column vector in R ** n(domain space) or matrix in R ** nxk (k points as columns, projected in one vectorized call)
+
+# Output Definition:
+# projectedX: column vector in R ** n or matrix in R ** nxk, satisfies constraint for every column
+# onBoundary(x): boolean array in R ** k, true for every column with c.T @ x >= d - eps*norm(c)
+# activeIndexSet: list of indices, empty if the constraint is not eps-active, otherwise the components with c[i, 0] != 0,
+# along which the normal points
+
+# Required files:
+# < none >
+
+# Test cases:
+# c = np.array([[1], [1]], dtype=float)
+# myHalfspace = projectionInHalfspace(c, 1)
+# x = np.array([[1], [2]], dtype=float)
+# myHalfspace.project(x) should return [[0], [1]]
+# myHalfspace.activeIndexSet(myHalfspace.project(x)) should return [0, 1]
+
+import numpy as np
+
+
+def matrnr():
+    # set your matriculation number here
+    matrnr = 23356687
+    return matrnr
+
+
+class projectionInHalfspace:
+
+    def __init__(self, c: np.array, d, eps=1.0e-6):
+        self.c = c # normal of the halfspace
+        self.d = d # offset of the halfspace
+        self.eps = eps # eps for tolerance
+        self.cc = float(c.T @ c) # squared norm of the normal
+        if self.cc <= 0: # check for nonzero normal
+            raise TypeError('c is zero.')
+
+    def project(self, x: np.array):
+        violation = np.maximum(self.c.T @ x - self.d, 0) # violation of every column, zero if feasible
+        projectedX = x - self.c * (violation / self.cc) # move violating columns along the normal
+        return projectedX
+
+    def onBoundary(self, x: np.array):
+        return np.ravel(self.c.T @ x) >= self.d - self.eps * np.sqrt(self.cc) # eps-active columns
+
+    def activeIndexSet(self, x: np.array):
+        if not self.onBoundary(x)[0]: # constraint is not active
+            return [] # no index is active
+        myList = list(np.flatnonzero(self.c[:, 0] != 0)) # components along the normal
+        return myList
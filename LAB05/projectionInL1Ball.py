@@ -0,0 +1,76 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# projection in L1 ball constraints
+
+# Purpose: if x is outside the ball sum(|x-origin|) <= radius, then it is projected to the closest point of the ball.
+# The absolute values of x-origin are projected onto the simplex with sum radius and the signs are restored,
+# so the projection costs O(n log n).
+
+# Class parameters:
+# origin: column vector in R ** n.
+# radius: positive scalar, radius of the ball
+# eps: nonnegative value, tolerance for accepting being active. Default value: 1.0e-6.
+
+# Input Definition:
+# x: column vector in R ** n(domain space) or matrix in R ** nxk (k points as columns, projected in one vectorized call)
+
+# Output Definition:
+# projectedX: column vector in R ** n or matrix in R ** nxk, satisfies constraint for every column
+# onBoundary(x): boolean array in R ** k, true for every column with | sum(|x-origin|) - radius | <= eps
+# activeIndexSet: list of indices, empty in the interior. On the boundary it contains all indices, since the outer
+# normal sign(x-origin) acts on the nonzero components and the corners of the ball block the zero components.
+# zeroIndexSet: list of indices, collected indices mark components with |x[i, 0]-origin[i, 0]| <= eps
+
+# Required files:
+# projectionOnSimplex.py
+
+# Test cases:
+# origin = np.array([[0], [0], [0]], dtype=float)
+# myBall = projectionInL1Ball(origin, 1)
+# x = np.array([[0.5], [-0.8], [0.1]], dtype=float)
+# myBall.project(x) should return [[0.35], [-0.65], [0]]
+# myBall.zeroIndexSet(myBall.project(x)) should return [2]
+# projectionInL1Ball(np.ones((5, 1)), 1.5).project(np.array([[5], [1], [1], [1], [1]])) should return
+# [[2.5], [1], [1], [1], [1]], also for integer input
+
+import numpy as np
+import projectionOnSimplex as PS
+
+
+def matrnr():
+    # set your matriculation number here
+    matrnr = 23356687
+    return matrnr
+
+
+class projectionInL1Ball:
+
+    def __init__(self, origin: np.array, radius, eps=1.0e-6):
+        self.origin = origin # center of the ball
+        self.radius = radius # radius of the ball
+        self.eps = eps # eps for tolerance
+        if radius <= 0: # check for positive radius
+            raise TypeError('radius is not positive.')
+        self.simplex = PS.projectionOnSimplex(origin.shape[0], radius) # simplex for the absolute values
+
+    def project(self, x: np.array):
+        D = x - self.origin # differences to the origin, one column per point
+        outside = np.sum(np.abs(D), axis=0) > self.radius # columns that violate the constraint
+        projectedX = x.astype(float) # feasible columns stay unchanged, float copy so integer input is not truncated
+        if np.any(outside): # some columns need a projection
+            Dout = D[:, outside] # violating differences
+            projectedX[:, outside] = self.origin + np.sign(Dout) * self.simplex.project(np.abs(Dout)) # project absolute values, restore signs
+        return projectedX
+
+    def onBoundary(self, x: np.array):
+        myNorm = np.sum(np.abs(x - self.origin), axis=0) # L1 distance of every column to the origin
+        return np.abs(myNorm - self.radius) <= self.eps # eps-active columns
+
+    def activeIndexSet(self, x: np.array):
+        if not self.onBoundary(x)[0]: # interior point
+            return [] # no index is active
+        myList = list(range(x.shape[0])) # boundary constraint acts on every component
+        return myList
+
+    def zeroIndexSet(self, x: np.array):
+        myList = list(np.flatnonzero(np.abs(x[:, 0] - self.origin[:, 0]) <= self.eps)) # components held at the origin
+        return myList
@@ -0,0 +1,77 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# projection in intersection of constraints
+
+# Purpose: x is projected to the closest point of the intersection of several convex sets, each given by its own
+# projection class (e.g. projectionInBox and projectionInHalfspace). Dykstra's algorithm cycles through the single
+# projections and carries a correction for every set, so the result converges to the projection onto the
+# intersection and not only to some point of it.
+
+# Class parameters:
+# projections: list of projection classes with methods .project() and .activeIndexSet(), the intersection must not be empty
+# tol: positive value, the iteration stops once a whole cycle changes the point and all corrections by at most tol.
+# The point alone may stay unchanged for a cycle before it moves again. Default value: 1.0e-10
+# maxIter: positive integer, maximal number of cycles. If the change is still bigger than tol after maxIter cycles,
+# project raises an Exception. Default value: 1000
+
+# Input Definition:
+# x: column vector in R ** n(domain space) or matrix in R ** nxk (k points as columns, if all projections accept them)
+
+# Output Definition:
+# projectedX: column vector in R ** n or matrix in R ** nxk, satisfies all constraints up to tol
+# activeIndexSet: list of indices, union of the active index sets of all projections
+
+# Required files:
+# < none >, the single projections are handed over
+
+# Test cases:
+# a = np.array([[0], [0]], dtype=float)
+# b = np.array([[1], [1]], dtype=float)
+# c = np.array([[1], [1]], dtype=float)
+# myIntersection = projectionIntersection([projectionInBox(a, b), projectionInHalfspace(c, 1)])
+# x = np.array([[2], [0.5]], dtype=float)
+# myIntersection.project(x) should return [[1], [0]]
+# myIntersection.activeIndexSet(myIntersection.project(x)) should return [0, 1]
+
+import numpy as np
+
+
+def matrnr():
+    # set your matriculation number here
+    matrnr = 23356687
+    return matrnr
+
+
+class projectionIntersection:
+
+    def __init__(self, projections, tol=1.0e-10, maxIter=1000):
+        if len(projections) == 0: # check for at least one set
+            raise TypeError('projections is empty.')
+        if tol <= 0: # check for positive tol
+            raise TypeError('range of tol is wrong!')
+        self.projections = projections # projections of the single sets
+        self.tol = tol # tolerance for the change per cycle
+        self.maxIter = maxIter # maximal number of cycles
+
+    def project(self, x: np.array):
+        if len(self.projections) == 1: # nothing to intersect
+            return self.projections[0].project(x)
+        projectedX = x.astype(float) # current point
+        corrections = [np.zeros_like(projectedX) for _ in self.projections] # Dykstra correction of every set
+        for _ in range(self.maxIter): # cycles over all sets
+            lastX = projectedX # point before this cycle
+            change = 0.0 # largest change of a correction in this cycle
+            for i, P in enumerate(self.projections): # project onto every set
+                y = projectedX + corrections[i] # add correction of this set
+                projectedX = P.project(y) # project onto this set
+                change = max(change, np.max(np.abs(y - projectedX - corrections[i]))) # change of the correction of this set
+                corrections[i] = y - projectedX # new correction of this set
+            if max(change, np.max(np.abs(projectedX - lastX))) <= self.tol: # cycle changed neither point nor corrections
+                return projectedX
+        raise Exception('projectionIntersection: no convergence within maxIter cycles!')
+
+    def activeIndexSet(self, x: np.array):
+        active = set() # union of all active indices
+        for P in self.projections: # collect active indices of every set
+            active.update(int(i) for i in P.activeIndexSet(x)) # add active indices of this set
+        myList = sorted(active) # sorted list as for a single projection
+        return myList
@@ -0,0 +1,72 @@
+# Optimization for Engineers - Dr.Johannes Hild
+# projection on simplex constraints
+
+# Purpose: x is projected to the closest point of the simplex {x : x[i, 0] >= 0, sum(x) = s}.
+# The projection is x - theta clipped at zero, where theta is found after sorting x, so it costs O(n log n).
+
+# Class parameters:
+# n: positive integer, dimension of the domain
+# s: positive scalar, sum of all components. Default value: 1
+# eps: nonnegative value, tolerance for accepting being active. Default value: 1.0e-6.
+
+# Input Definition:
+# x: column vector in R ** n(domain space) or matrix in R ** nxk (k points as columns, projected in one vectorized call)
+
+# Output Definition:
+# projectedX: column vector in R ** n or matrix in R ** nxk, satisfies constraint for every column
+# activeIndexSet: list of all indices. The constraint sum(x) = s is always active and its normal acts on every
+# component, so projected descent methods that reduce their matrices on active indices (projectedBFGSDescent) take
+# projected gradient steps, which are descent directions on the simplex.
+# lowerBoundIndexSet: list of indices, collected indices mark x[i, 0] components with x[i, 0] <= eps
+# sample(m, rng): matrix in R ** nxm, m points drawn uniformly from the simplex as columns. rng is an optional numpy Generator.
+
+# Required files:
+# < none >
+
+# Test cases:
+# mySimplex = projectionOnSimplex(3, 1)
+# x = np.array([[0.5], [0.8], [-0.3]], dtype=float)
+# mySimplex.project(x) should return [[0.35], [0.65], [0]]
+# mySimplex.lowerBoundIndexSet(mySimplex.project(x)) should return [2]
+
+import numpy as np
+
+
+def matrnr():
+    # set your matriculation number here
+    matrnr = 23356687
+    return matrnr
+
+
+class projectionOnSimplex:
+
+    def __init__(self, n, s=1, eps=1.0e-6):
+        self.n = n # dimension of the domain
+        self.s = s # sum of all components
+        self.eps = eps # eps for tolerance
+        if s <= 0: # check for positive sum
+            raise TypeError('s is not positive.')
+
+    def project(self, x: np.array):
+        n = x.shape[0] # get vector dimension
+        u = -np.sort(-x, axis=0) # components of every column in decreasing order
+        cumsum = np.cumsum(u, axis=0) - self.s # partial sums minus the target sum
+        index = np.arange(1, n + 1).reshape(-1, 1) # number of components in the partial sums
+        rho = np.sum(u - cumsum / index > 0, axis=0) # number of positive components of the projection per column
+        theta = cumsum[rho - 1, np.arange(x.shape[1])] / rho # shift for every column
+        projectedX = np.maximum(x - theta, 0) # shift and clip at zero
+        return projectedX
+
+    def activeIndexSet(self, x: np.array):
+        myList = list(range(x.shape[0])) # equality constraint is active in every component
+        return myList
+
+    def lowerBoundIndexSet(self, x: np.array):
+        myList = list(np.flatnonzero(x[:, 0] <= self.eps)) # components at their lower bound
+        return myList
+
+    def sample(self, m: int, rng=None):
+        if rng is None: # no generator handed over
+            rng = np.random.default_rng() # use a freshly seeded one
+        X = self.s * rng.dirichlet(np.ones(self.n), m).T # uniform points in the simplex as columns
+        return X